@@ -7,25 +7,65 @@ Duas áreas (interna + externa) → MESMA PLANILHA
 
 import gspread
 from google.oauth2.service_account import Credentials
+from google.auth.transport.requests import AuthorizedSession, Request
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout as RequestsTimeout
 from datetime import datetime
 import logging
+import logging.handlers
+import atexit
 import os
-import traceback
+import argparse
+import sys
+import contextlib
 import time
+import enum
 import json
+import math
+import operator
+import re
+import random
+import sqlite3
+import numpy as np
 import serial
 import threading
+import queue
+import selectors
+from collections import deque
 import serial.tools.list_ports
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
 from dotenv import load_dotenv
 
+# orjson é opcional: parse direto de bytes em C, bem mais rápido que o json da stdlib
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Limpeza de tela via ANSI (só em terminal; em log/arquivo não polui a saída)
+_CLEAR_SCREEN = '\x1b[H\x1b[2J' if sys.stdout.isatty() else ''
+
 # Configuração básica de logging
+# ✅ Threads só enfileiram o registro; escrita em arquivo (cartão SD) e console fica numa thread própria
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.handlers.RotatingFileHandler('gravata_dual_radar.log', maxBytes=5_000_000, backupCount=3),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Esvazia a fila antes de encerrar o processo
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))  # Formato final é aplicado pelo listener
+
 logging.basicConfig(
-    level=logging.DEBUG,  # ✅ TEMPORÁRIO: Debug ativo para diagnóstico
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('gravata_dual_radar.log'),
-        logging.StreamHandler()
-    ]
+    level=logging.INFO,  # DEBUG só para diagnóstico: o caminho de zonas fica sem custo de log
+    handlers=[_queue_handler]
 )
 logger = logging.getLogger('gravata_dual_radar')
 
@@ -62,17 +102,258 @@ RADAR_CONFIGS = [
 # Configurações gerais
 CREDENTIALS_FILE = 'serial_radar/credenciais.json'
 
+# Termos (já em minúsculas) que indicam uma porta adequada para o radar
+RADAR_PORT_TERMS = ('usb', 'serial', 'uart', 'cp210', 'ch340', 'ft232', 'arduino', 'esp32', 'jtag', 'modem')
+# Uma única alternação compilada: a descrição é varrida uma vez, em C
+_RADAR_PORT_RE = re.compile("|".join(map(re.escape, RADAR_PORT_TERMS)), re.IGNORECASE)
+
+# VIDs USB dos conversores usados pelos radares (CP210x, CH340, FTDI, ESP32-S3 nativo)
+KNOWN_RADAR_VIDS = {0x10C4, 0x1A86, 0x0403, 0x303A}
+
+# Limite do buffer em memória: ao encher, descarta a linha mais antiga (back-pressure)
+PENDING_DATA_MAXLEN = 1024
+
+# Diário local (SQLite) para linhas não enviadas ao Sheets; máximo de linhas reenviadas por lote
+JOURNAL_FILE = 'gravata_journal.db'
+JOURNAL_DRAIN_BATCH = 200
+
+# Descrições amigáveis das zonas (montadas uma vez, não a cada chamada)
+ZONE_DESCRIPTIONS = {
+    # Área externa (2 zonas simples)
+    'AREA_INTERESSE': 'Área de Interesse',
+    'AREA_PASSAGEM': 'Área de Passagem',
+    # ✅ Área interna (IGUAL AO SANTA CRUZ)
+    'SALA_REBOCO': 'Sala de Reboco',
+    'IGREJINHA': 'Igrejinha',
+    'CENTRO': 'Centro',
+    'ARGOLA': 'Jogo da Argola',
+    'BEIJO': 'Barraca do Beijo',
+    'PESCARIA': 'Pescaria',
+    'FORA_ATIVACOES': 'Fora das Ativações'
+}
+
+# ✅ Fallback de zona (ponto fora de todas as zonas específicas) - fonte única das regras.
+# Cada região é uma sequência de (distância máxima, zona) testada em ordem
+FALLBACK_EXTERNA = ((3.5, 'AREA_INTERESSE'),)         # Além disso: AREA_PASSAGEM
+FALLBACK_SIDE_X = 0.8                                 # |X| acima disso: lado esquerdo/direito
+FALLBACK_LEFT = ((3.0, 'SALA_REBOCO'), (7.0, 'IGREJINHA'))
+FALLBACK_RIGHT = ((2.5, 'BEIJO'), (5.0, 'PESCARIA'), (8.0, 'ARGOLA'))
+FALLBACK_CENTER = ((1.5, 'CENTRO'),)                  # Só muito próximo é centro
+# Centro até FALLBACK_SPLIT_DISTANCE vai para um dos lados: (Y > FALLBACK_SPLIT_Y, X < 0) → zona
+FALLBACK_SPLIT_DISTANCE = 4.0
+FALLBACK_SPLIT_Y = 2.5
+FALLBACK_SPLIT = {
+    (True, True): 'IGREJINHA', (True, False): 'ARGOLA',
+    (False, True): 'SALA_REBOCO', (False, False): 'BEIJO',
+}
+
+# Frame repetido só redesenha a tela após este intervalo (s)
+DISPLAY_REFRESH = 5.0
+
+# Quota de escrita do Sheets (requisições/minuto por usuário) e penalidade após 429 (s)
+SHEETS_WRITES_PER_MINUTE = 60
+SHEETS_QUOTA_PENALTY = 30.0
+
+# Status de um radar é reaproveitado por este intervalo (s) entre chamadas consecutivas
+STATUS_CACHE_TTL = 1.0
+
+# Status inalterado é registrado no máximo a cada N ticks de 30s (20 → heartbeat a cada 10 min)
+STATUS_HEARTBEAT_TICKS = 20
+
+# Banner de inicialização (texto estático, montado uma única vez)
+_BANNER = "\n".join([
+    "=" * 80,
+    "👥 CONTADOR DUAL GRAVATÁ - SISTEMA ESP32 v4.2 AVANÇADO",
+    "=" * 80,
+    "🚀 Sistema CORRIGIDO v4.3 - Tracking Preciso para Eventos:",
+    "   • Duas áreas simultâneas (EXTERNA + INTERNA)",
+    "   • Lógica baseada em POSIÇÃO REAL (não IDs do Arduino)",
+    "   • Detecção precisa de entrada/saída por zona",
+    "   • Pessoas paradas contam apenas UMA vez",
+    "   • Anti-flickering: evita contagem duplicada",
+    "   • Ideal para eventos com muitas pessoas",
+    "   • Tracking por zona + distância + posição",
+    "⚡ Sistema ativo - Dados sendo enviados para Google Sheets",
+    "🔄 Reconexão automática habilitada",
+    "=" * 80,
+])
+
+# Escopos do Google (tupla imutável, montada uma vez)
+_SCOPES = (
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive',
+    'https://www.googleapis.com/auth/drive.file',
+)
+
+# Credenciais já lidas do disco (uma por arquivo): evita reler/parsear a chave RSA a cada conexão
+_CREDS_CACHE = {}
+
+# Clientes gspread compartilhados entre os gerenciadores de planilha (um por arquivo de credenciais)
+_SHEETS_CLIENTS = {}
+_SHEETS_CLIENTS_LOCK = threading.Lock()
+
+def _get_credentials(creds_path):
+    """Retorna as credenciais em cache para o arquivo, renovando o token só se expirado"""
+    with _SHEETS_CLIENTS_LOCK:
+        creds = _CREDS_CACHE.get(creds_path)
+        if creds is None:
+            creds = Credentials.from_service_account_file(creds_path, scopes=_SCOPES)
+            _CREDS_CACHE[creds_path] = creds
+    if creds.expired:
+        creds.refresh(Request())
+    return creds
+
+def _get_sheets_client(creds_path):
+    """Retorna o cliente gspread compartilhado (mesma sessão HTTP, pool e token) para as credenciais"""
+    creds = _get_credentials(creds_path)
+    with _SHEETS_CLIENTS_LOCK:
+        client = _SHEETS_CLIENTS.get(creds_path)
+        if client is None:
+            session = AuthorizedSession(creds)
+            session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+            client = gspread.Client(auth=creds, session=session)
+            _SHEETS_CLIENTS[creds_path] = client
+        return client
+
+_sqrt = math.sqrt  # Evita o lookup de atributo em get_distance (chamado por detecção)
+
+def _is_radar_port(description):
+    """Indica se a descrição da porta sugere um conversor USB-serial de radar"""
+    return _RADAR_PORT_RE.search(description or '') is not None
+
+def _backoff_delay(attempt, base, cap):
+    """Atraso exponencial com jitter (evita que os dois radares repitam tentativas em sincronia)"""
+    return min(cap, base * 2 ** attempt) * (1 + random.uniform(0, 0.5))
+
+def _worker_cores():
+    """Núcleos fora do núcleo 0 (loop de monitoramento); com um único núcleo, devolve {0}"""
+    return set(range(1, os.cpu_count() or 1)) or {0}
+
+def _pin_current_thread(cores, niceness=0):
+    """Fixa a thread atual nos núcleos indicados e ajusta prioridade (Linux); ignora se não suportado"""
+    cpu_count = os.cpu_count() or 1
+    if cpu_count > 1 and hasattr(os, 'sched_setaffinity'):
+        # Menos núcleos que radares: reaproveita os núcleos 1.., sem cair no núcleo 0 do monitoramento
+        cores = {1 + (core - 1) % (cpu_count - 1) if core else 0 for core in cores}
+        try:
+            os.sched_setaffinity(0, cores)  # 0 = thread atual
+        except OSError as e:
+            logger.debug("Afinidade de CPU não aplicada: %s", e)
+    if niceness:
+        try:
+            os.nice(niceness)  # Valores negativos exigem CAP_SYS_NICE
+        except (AttributeError, OSError) as e:
+            logger.debug("Prioridade (nice %d) não aplicada: %s", niceness, e)
+
+def _set_low_latency(device):
+    """Ajusta o latency_timer do conversor USB-serial para 1ms (Linux, via sysfs)"""
+    name = os.path.basename(os.path.realpath(device))
+    path = f"/sys/bus/usb-serial/devices/{name}/latency_timer"
+    try:
+        with open(path, 'w') as f:
+            f.write('1')
+        return True
+    except OSError:
+        return False
+
+class RowJournal:
+    """Diário local (SQLite) das linhas que não puderam ser enviadas ao Google Sheets"""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pending_rows ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, radar_id TEXT NOT NULL, row TEXT NOT NULL)"
+        )
+
+    def enqueue(self, radar_id, rows):
+        """Guarda linhas para envio posterior"""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO pending_rows (radar_id, row) VALUES (?, ?)",
+                [(radar_id, json.dumps(row)) for row in rows]
+            )
+
+    def drain(self, radar_id, limit):
+        """Retorna (ids, linhas) mais antigas do radar, sem removê-las"""
+        with self._lock:
+            records = self._conn.execute(
+                "SELECT id, row FROM pending_rows WHERE radar_id = ? ORDER BY id LIMIT ?",
+                (radar_id, limit)
+            ).fetchall()
+        return [record[0] for record in records], [json.loads(record[1]) for record in records]
+
+    def delete(self, ids):
+        """Remove linhas já enviadas com sucesso"""
+        with self._lock:
+            self._conn.executemany("DELETE FROM pending_rows WHERE id = ?", [(row_id,) for row_id in ids])
+
+class TokenBucket:
+    """Limitador token bucket thread-safe (compartilhado pelos gerenciadores de planilha)"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate          # Tokens repostos por segundo
+        self.capacity = capacity  # Rajada máxima
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0  # Penalidade após 429 (time.monotonic)
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        """Consome um token, esperando no máximo `timeout` segundos; retorna False se não deu"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def penalize(self, seconds):
+        """Após 429: esvazia o balde e bloqueia novas requisições por `seconds`"""
+        with self._lock:
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+# ✅ Quota do Sheets é por usuário (conta de serviço): um único limitador para as duas áreas
+SHEETS_LIMITER = TokenBucket(rate=SHEETS_WRITES_PER_MINUTE / 60.0, capacity=SHEETS_WRITES_PER_MINUTE)
+
+class WriteResult(enum.Enum):
+    """Resultado de uma única tentativa de escrita no Sheets"""
+    OK = 'ok'
+    RETRY_TRANSIENT = 'retry_transient'            # 5xx/rede: vale repetir após backoff
+    QUOTA_EXCEEDED = 'quota_exceeded'              # 429: adia o envio (penalidade maior que o orçamento)
+    RECONNECT_THEN_RETRY = 'reconnect_then_retry'  # 401: token/sessão inválidos
+    GIVE_UP = 'give_up'                            # Erro definitivo (ex.: 400/403/404)
+
 class GoogleSheetsManager:
+    # Tempo (s) durante o qual o resultado do health_check() é reaproveitado
+    HEALTH_CHECK_TTL = 90.0
+    # Circuit breaker: abre após N falhas consecutivas e fica aberto por COOLDOWN segundos
+    BREAKER_THRESHOLD = 3
+    BREAKER_COOLDOWN = 60.0
+    # Repetições de erro transitório por envio (dentro do orçamento de tempo do chamador)
+    WRITE_RETRIES = 1
+
     def __init__(self, creds_path, spreadsheet_id, radar_id):
-        SCOPES = [
-            'https://www.googleapis.com/auth/spreadsheets',
-            'https://www.googleapis.com/auth/drive',
-            'https://www.googleapis.com/auth/drive.file'
-        ]
         self.radar_id = radar_id
         self.spreadsheet_id = spreadsheet_id
-        self.creds = Credentials.from_service_account_file(creds_path, scopes=SCOPES)
-        self.gc = gspread.authorize(self.creds)
+        self.creds_path = creds_path
+        self._last_health_check = None  # (time.monotonic(), resultado)
+        self.consecutive_failures = 0
+        self._breaker_open_until = None  # time.monotonic() até quando o breaker fica aberto
+        self._headers_verified = False   # Cabeçalho lido/ajustado uma única vez
+        # ✅ Um único cliente para as duas áreas: um handshake TLS, um pool e um token compartilhados
+        self.gc = _get_sheets_client(creds_path)
         
         try:
             self.spreadsheet = self.gc.open_by_key(spreadsheet_id)
@@ -92,6 +373,8 @@ class GoogleSheetsManager:
 
     def _setup_headers(self):
         """✅ Configura cabeçalhos IGUAL AO SANTA CRUZ (9 campos simplificados)"""
+        if self._headers_verified:
+            return  # Já verificado: evita um GET pago na quota de leitura
         try:
             headers = self.worksheet.row_values(1)
             # ✅ IGUAL AO SANTA CRUZ: Apenas campos ESSENCIAIS para contagem de pessoas
@@ -104,19 +387,154 @@ class GoogleSheetsManager:
                 'distance',           # Distância (metros)
                 'confidence',         # Confiança da detecção (%)
                 'total_detected',     # Total acumulativo
-                'max_simultaneous'    # Máximo simultâneo
+                'max_simultaneous',   # Máximo simultâneo
+                'samples'             # Leituras consecutivas idênticas agrupadas na linha
             ]
             
             if not headers or len(headers) < 9:
-                logger.info("🔧 Configurando cabeçalhos simplificados (9 campos essenciais)")
+                logger.info("🔧 Configurando cabeçalhos simplificados (10 campos essenciais)")
                 self.worksheet.clear()
-                self.worksheet.append_row(expected_headers)
+                self.worksheet.append_row(expected_headers, value_input_option='RAW')
+            elif len(headers) < len(expected_headers):
+                # Planilha antiga (9 campos): só acrescenta a coluna nova, sem apagar dados
+                logger.info("🔧 Adicionando coluna 'samples' aos cabeçalhos")
+                self.worksheet.update([expected_headers], 'A1', value_input_option='RAW')
             else:
                 logger.info("✅ Cabeçalhos simplificados verificados")
+            self._headers_verified = True
                     
         except Exception as e:
             logger.warning(f"⚠️ Erro ao configurar cabeçalhos: {e}")
 
+    def append_rows_batch(self, rows, budget=None):
+        """Envia várias linhas em uma única chamada à API (spreadsheets.values.append)
+        
+        Retorna False, sem chamar a API, enquanto o circuit breaker estiver aberto ou se
+        a quota (SHEETS_LIMITER) não liberar a chamada dentro do orçamento; após um 429
+        também retorna False na hora (o chamador guarda as linhas no diário).
+        Reconecta no máximo uma vez e nunca passa de `budget` segundos em backoff.
+        """
+        if not self._breaker_allows_request():
+            return False
+        
+        deadline = time.monotonic() + budget if budget is not None else float('inf')
+        reconnected = False
+        attempt = 0
+        while True:
+            if not SHEETS_LIMITER.acquire(timeout=max(0.0, deadline - time.monotonic()) if budget is not None else None):
+                logger.warning("⏳ Quota de escrita esgotada - envio %s adiado", self.radar_id)
+                return False
+            result, error = self._do_write_once(rows)
+            if result is WriteResult.OK:
+                self._record_success()
+                return True
+            if result is WriteResult.QUOTA_EXCEEDED:
+                # Repetir aqui só gastaria o orçamento em sleep: o limiter segura a próxima chamada
+                logger.warning("⏳ Quota de escrita esgotada - envio %s adiado", self.radar_id)
+                return False
+            
+            if result is WriteResult.RECONNECT_THEN_RETRY and not reconnected:
+                reconnected = True
+                try:
+                    self._reconnect()
+                    continue
+                except Exception as e:
+                    error = e
+            elif result is WriteResult.RETRY_TRANSIENT and attempt < self.WRITE_RETRIES:
+                delay = _backoff_delay(attempt, base=1.0, cap=4.0)
+                if time.monotonic() + delay < deadline:
+                    logger.warning("⚠️ Falha transitória no envio %s (%s) - repetindo em %.1fs", self.radar_id, error, delay)
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+            
+            self._record_failure()
+            raise error
+
+    def _do_write_once(self, rows):
+        """Uma tentativa de escrita; retorna (WriteResult, exceção ou None) sem repetir nada"""
+        try:
+            self.worksheet.append_rows(rows, value_input_option='RAW', insert_data_option='INSERT_ROWS')
+        except gspread.exceptions.APIError as e:
+            status = e.response.status_code
+            if status == 401:
+                return WriteResult.RECONNECT_THEN_RETRY, e
+            if status == 429:
+                SHEETS_LIMITER.penalize(SHEETS_QUOTA_PENALTY)  # Quota estourada: pausa as duas áreas
+                return WriteResult.QUOTA_EXCEEDED, e
+            if status >= 500:
+                return WriteResult.RETRY_TRANSIENT, e
+            return WriteResult.GIVE_UP, e
+        except (RequestsConnectionError, RequestsTimeout) as e:
+            return WriteResult.RETRY_TRANSIENT, e
+        except Exception as e:
+            return WriteResult.GIVE_UP, e
+        return WriteResult.OK, None
+
+    def _reconnect(self):
+        """Renova o token e reabre planilha/worksheet (usado após 401)"""
+        logger.info("🔄 Reconectando planilha %s (credenciais expiradas)...", self.radar_id)
+        _get_credentials(self.creds_path).refresh(Request())
+        self.spreadsheet = self.gc.open_by_key(self.spreadsheet_id)
+        self.worksheet = self.spreadsheet.get_worksheet(0)
+
+    def _breaker_allows_request(self):
+        """Circuit breaker: bloqueia chamadas enquanto aberto; meio-aberto faz uma sonda leve"""
+        if self._breaker_open_until is None:
+            return True
+        if time.monotonic() < self._breaker_open_until:
+            return False
+        
+        # Meio-aberto: a própria escrita serve de sonda (sem leitura extra na quota);
+        # se falhar, _record_failure() reabre o breaker, pois as falhas seguem acima do limite
+        logger.info("🔌 Circuit breaker %s meio-aberto - testando com o próximo envio", self.radar_id)
+        return True
+
+    def _record_failure(self):
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.BREAKER_THRESHOLD:
+            self._breaker_open_until = time.monotonic() + self.BREAKER_COOLDOWN
+            logger.warning("🔌 Circuit breaker aberto para %s após %d falhas (%.0fs)",
+                           self.radar_id, self.consecutive_failures, self.BREAKER_COOLDOWN)
+
+    def _record_success(self):
+        if self._breaker_open_until is not None:
+            logger.info("✅ Planilha %s respondeu - circuit breaker fechado", self.radar_id)
+        self.consecutive_failures = 0
+        self._breaker_open_until = None
+        # Escrita aceita já prova que a planilha responde: health_check não precisa chamar a API
+        self._last_health_check = (time.monotonic(), True)
+
+    def health_check(self, force=False):
+        """Verifica se a planilha responde (resultado em cache por HEALTH_CHECK_TTL segundos)"""
+        now = time.monotonic()
+        if self._breaker_open_until is not None and now < self._breaker_open_until:
+            return False  # Breaker aberto: não gasta uma chamada à API para confirmar a falha
+        if not force and self._last_health_check is not None:
+            checked_at, healthy = self._last_health_check
+            if now - checked_at < self.HEALTH_CHECK_TTL:
+                return healthy
+        
+        try:
+            self.spreadsheet.fetch_sheet_metadata()
+            healthy = True
+        except Exception as e:
+            logger.warning("⚠️ Planilha %s não respondeu ao health check: %s", self.radar_id, e)
+            healthy = False
+        
+        self._last_health_check = (now, healthy)
+        return healthy
+
+class Zone(NamedTuple):
+    """Limites de uma zona já achatados (posição + faixa de distância)"""
+    name: str
+    x_min: float
+    x_max: float
+    y_min: float
+    y_max: float
+    d_min: float
+    d_max: float
+
 class ZoneManager:
     def __init__(self, area_tipo):
         self.area_tipo = area_tipo
@@ -176,112 +594,91 @@ class ZoneManager:
                 }
             }
         
-    def get_zone(self, x, y):
-        """Determinar zona MELHORADA - prioriza posição X e distância"""
-        distance = self.get_distance(x, y)
+        # ✅ Limites pré-calculados em Zones imutáveis (evita lookups de dict a cada detecção)
+        self._zones = tuple(
+            Zone(name, c['x_min'], c['x_max'], c['y_min'], c['y_max'],
+                 c['distance_range'][0], c['distance_range'][1])
+            for name, c in self.ZONA_CONFIGS.items()
+        )
         
-        # Debug temporário para mostrar teste de zonas
-        debug_info = []
+    def get_zones_bulk(self, xs, ys):
+        """Classifica várias posições de uma vez (NumPy): zona específica ou fallback por posição X e distância"""
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        distances = np.sqrt(xs * xs + ys * ys)
         
+        # Fallback vetorizado, montado a partir das regras FALLBACK_*
         if self.area_tipo == 'EXTERNA':
-            # Área externa: verifica posição e distância
-            for zona_name, config in self.ZONA_CONFIGS.items():
-                if (config['x_min'] <= x <= config['x_max'] and
-                    config['y_min'] <= y <= config['y_max'] and
-                    config['distance_range'][0] <= distance <= config['distance_range'][1]):
-                    return zona_name
-            
-            # Fallback baseado na distância
-            if distance <= 3.5:
-                return 'AREA_INTERESSE'
-            else:
-                return 'AREA_PASSAGEM'
-        
-        else:  # INTERNA - LÓGICA MELHORADA
-            # ✅ PRIMEIRO: Testa todas as zonas específicas
-            for zona_name, config in self.ZONA_CONFIGS.items():
-                x_ok = config['x_min'] <= x <= config['x_max']
-                y_ok = config['y_min'] <= y <= config['y_max']
-                dist_ok = config['distance_range'][0] <= distance <= config['distance_range'][1]
-                
-                debug_info.append(f"{zona_name}: X({x_ok}) Y({y_ok}) D({dist_ok})")
-                
-                if x_ok and y_ok and dist_ok:
-                    logger.info(f"🎯 ZONA ENCONTRADA por configuração específica: {zona_name}")
-                    logger.info(f"   Testes: {' | '.join(debug_info)}")
-                    return zona_name
-            
-            # ✅ SEGUNDO: Fallback baseado PRINCIPALMENTE na posição X e distância
-            logger.info(f"🔄 FALLBACK ATIVADO - Nenhuma zona específica encontrada")
-            logger.info(f"   Testes realizados: {' | '.join(debug_info)}")
-            
-            if x < -0.8:  # LADO ESQUERDO
-                logger.info(f"📍 FALLBACK: LADO ESQUERDO (X={x:.2f} < -0.8)")
-                if distance <= 3.0:
-                    logger.info(f"   ✅ Distância {distance:.2f}m ≤ 3.0m → SALA_REBOCO")
-                    return 'SALA_REBOCO'
-                elif distance <= 7.0:
-                    logger.info(f"   ✅ Distância {distance:.2f}m ≤ 7.0m → IGREJINHA")
-                    return 'IGREJINHA'
-                else:
-                    logger.info(f"   ❌ Distância {distance:.2f}m > 7.0m → FORA_ATIVACOES")
-                    return 'FORA_ATIVACOES'
-                    
-            elif x > 0.8:  # LADO DIREITO
-                logger.info(f"📍 FALLBACK: LADO DIREITO (X={x:.2f} > 0.8)")
-                if distance <= 2.5:
-                    logger.info(f"   ✅ Distância {distance:.2f}m ≤ 2.5m → BEIJO")
-                    return 'BEIJO'
-                elif distance <= 5.0:
-                    logger.info(f"   ✅ Distância {distance:.2f}m ≤ 5.0m → PESCARIA")
-                    return 'PESCARIA'
-                elif distance <= 8.0:
-                    logger.info(f"   ✅ Distância {distance:.2f}m ≤ 8.0m → ARGOLA")
-                    return 'ARGOLA'
-                else:
-                    logger.info(f"   ❌ Distância {distance:.2f}m > 8.0m → FORA_ATIVACOES")
-                    return 'FORA_ATIVACOES'
-                    
-            else:  # CENTRO (-0.8 <= X <= 0.8)
-                logger.info(f"📍 FALLBACK: ZONA CENTRAL (-0.8 ≤ X={x:.2f} ≤ 0.8)")
-                if distance <= 1.5:
-                    logger.info(f"   ✅ Distância {distance:.2f}m ≤ 1.5m → CENTRO")
-                    return 'CENTRO'  # Só muito próximo é centro
-                elif distance <= 4.0:
-                    # Baseado em Y para decidir se vai para lado esquerdo ou direito
-                    if y > 2.5:
-                        result = 'IGREJINHA' if x < 0 else 'ARGOLA'
-                        logger.info(f"   ✅ Y={y:.2f} > 2.5, X={'<0' if x<0 else '≥0'} → {result}")
-                        return result
-                    else:
-                        result = 'SALA_REBOCO' if x < 0 else 'BEIJO'
-                        logger.info(f"   ✅ Y={y:.2f} ≤ 2.5, X={'<0' if x<0 else '≥0'} → {result}")
-                        return result
-                else:
-                    logger.info(f"   ❌ Distância {distance:.2f}m > 4.0m → FORA_ATIVACOES")
-                    return 'FORA_ATIVACOES'
-    
+            regions = ((True, FALLBACK_EXTERNA),)
+            default = 'AREA_PASSAGEM'
+        else:
+            left = xs < -FALLBACK_SIDE_X
+            right = xs > FALLBACK_SIDE_X
+            center = ~(left | right)
+            regions = ((left, FALLBACK_LEFT), (right, FALLBACK_RIGHT), (center, FALLBACK_CENTER))
+            default = 'FORA_ATIVACOES'
+        conditions = [region & (distances <= d_max) for region, rules in regions for d_max, _ in rules]
+        choices = [zone for _, rules in regions for _, zone in rules]
+        if self.area_tipo != 'EXTERNA':
+            # Centro sem faixa própria: decide o lado por Y e pelo sinal de X
+            split = center & (distances <= FALLBACK_SPLIT_DISTANCE)
+            far = ys > FALLBACK_SPLIT_Y
+            negative = xs < 0
+            for (y_far, x_negative), zone in FALLBACK_SPLIT.items():
+                conditions.append(split & (far == y_far) & (negative == x_negative))
+                choices.append(zone)
+        zones = np.select(conditions, choices, default=default).astype(object)
+        
+        # Zonas específicas têm prioridade: primeira zona (na ordem de ZONA_CONFIGS) que contém o ponto
+        matched = np.zeros(xs.shape, dtype=bool)
+        if self._zones:
+            names = np.array([z.name for z in self._zones], dtype=object)
+            bounds = np.array([z[1:] for z in self._zones], dtype=float)  # Colunas x_min..d_max
+            x_col, y_col, d_col = xs[:, None], ys[:, None], distances[:, None]
+            mask = ((bounds[:, 0] <= x_col) & (x_col <= bounds[:, 1]) &
+                    (bounds[:, 2] <= y_col) & (y_col <= bounds[:, 3]) &
+                    (bounds[:, 4] <= d_col) & (d_col <= bounds[:, 5]))
+            matched = mask.any(axis=1)
+            zones[matched] = names[mask.argmax(axis=1)[matched]]
+        
+        # Diagnóstico por pessoa (--debug) só é montado quando DEBUG está ativo
+        if logger.isEnabledFor(logging.DEBUG):
+            for x, y, d, zone, specific in zip(xs.tolist(), ys.tolist(), distances.tolist(),
+                                               zones.tolist(), matched.tolist()):
+                logger.debug("🎯 X=%.2f Y=%.2f D=%.2fm → %s (%s)", x, y, d, zone,
+                             'configuração específica' if specific else 'fallback')
+        
+        return zones.tolist()
+
     def get_distance(self, x, y):
         """Calcular distância do radar"""
-        import math
-        return math.sqrt(x**2 + y**2)
+        return _sqrt(x * x + y * y)
     
     def get_zone_description(self, zone_name):
         """Retorna descrição amigável da zona"""
-        descriptions = {
-            # Área externa (2 zonas simples)
-            'AREA_INTERESSE': 'Área de Interesse',
-            'AREA_PASSAGEM': 'Área de Passagem',
-            # ✅ Área interna (IGUAL AO SANTA CRUZ)
-            'SALA_REBOCO': 'Sala de Reboco',
-            'IGREJINHA': 'Igrejinha', 
-            'CENTRO': 'Centro',
-            'ARGOLA': 'Jogo da Argola',
-            'BEIJO': 'Barraca do Beijo',
-            'PESCARIA': 'Pescaria',
-            'FORA_ATIVACOES': 'Fora das Ativações'
-        }
-        return descriptions.get(zone_name, zone_name)
+        return ZONE_DESCRIPTIONS.get(zone_name, zone_name)
+
+class TrackState:
+    """Pessoas rastreadas em arrays paralelos (SoA) para casamento vetorizado por zona/distância"""
+    __slots__ = ('ids', 'zones', 'distances', 'last_seen')
+
+    def __init__(self, people=None):
+        people = people or {}
+        count = len(people)
+        self.ids = list(people)
+        self.zones = np.array([p.get('zone', '') for p in people.values()], dtype=object)
+        self.distances = np.fromiter((p.get('distance_smoothed', 0) for p in people.values()), dtype=np.float64, count=count)
+        self.last_seen = np.fromiter((p.get('last_seen', 0) for p in people.values()), dtype=np.float64, count=count)
+
+    def first_match(self, zone, distance, tolerance, now=None, max_age=None):
+        """ID da primeira pessoa (ordem de inserção) na mesma zona e dentro da tolerância, ou None"""
+        if not self.ids:
+            return None
+        mask = (self.zones == zone) & (np.abs(self.distances - distance) < tolerance)
+        if max_age is not None:
+            mask &= (now - self.last_seen) < max_age
+        index = int(mask.argmax())
+        return self.ids[index] if mask[index] else None
 
 class SingleRadarCounter:
     def __init__(self, config):
@@ -299,24 +696,50 @@ class SingleRadarCounter:
         self.receive_thread = None
         self.gsheets_manager = None
         self.zone_manager = ZoneManager(self.area_tipo)
+        self.verbose_display = config.get('verbose_display', True)  # False → modo headless (sem tela)
+        self._ts_cache = (None, '')  # (segundo, timestamp formatado) de convert_timestamp
+        self._last_frame_key = None  # Último frame exibido (contagem + posições arredondadas)
+        self._last_display = float('-inf')
+        self.cpu_core = None  # Núcleo dedicado à thread de leitura (definido pelo sistema dual)
+        self.journal = None   # RowJournal para linhas não enviadas (definido pelo sistema dual)
+        
+        # ✅ Leitura e processamento desacoplados: a thread serial só faz parse e enfileira
+        self.process_thread = None
+        self._json_q = deque(maxlen=256)       # Frames já parseados aguardando processamento
+        self._json_ready = threading.Event()   # Sinaliza frame novo (e acorda no stop)
+        
+        # ✅ Envio à planilha em thread própria: a rede nunca atrasa o processamento dos frames
+        self.sheets_thread = None
+        self._sheets_stop = threading.Event()  # Acorda e encerra a thread de envio no stop
+        self._pending_lock = threading.Lock()  # Protege pending_data/pending_evicted entre as threads
         
         # Sistema robusto de contagem de pessoas (igual ao Santa Cruz)
         self.current_people = {}
         self.previous_people = {}
+        self._tracked = TrackState()           # Snapshot SoA de current_people (casamento do próximo frame)
+        self._previous_tracked = TrackState()  # Snapshot SoA de previous_people
         self.people_history = {}
         self.total_people_detected = 0
         self.max_simultaneous_people = 0
         self.session_start_time = datetime.now()
+        self.session_start_mono = time.monotonic()  # Base monotônica para a duração da sessão
         
         # Configurações de tracking
         self.exit_timeout = 3.0
         self.reentry_timeout = 10.0
-        self.last_update_time = time.time()
+        self.last_update_time = time.monotonic()
         
         # ✅ CONTROLE DE PLANILHA IGUAL AO SANTA CRUZ
-        self.last_sheets_write = 0              # Último envio para planilha
+        self.last_sheets_write = float('-inf')  # Último envio para planilha (time.monotonic)
         self.sheets_write_interval = 30.0       # ✅ IGUAL SANTA CRUZ: 30 segundos
-        self.pending_data = []                  # Buffer de dados pendentes
+        self.pending_data = deque(maxlen=PENDING_DATA_MAXLEN)  # Buffer limitado de dados pendentes
+        self.pending_evicted = 0                # Linhas descartadas por buffer cheio
+        self.sheets_failures = 0                # Falhas consecutivas de envio
+        self.sheets_retry_at = float('-inf')    # Próxima tentativa após falha (time.monotonic)
+        self.sheets_flush_offset = 0.0          # Defasagem do 1º envio (definida pelo sistema dual)
+        self.status_event = None                # Evento do sistema: acorda o monitor em transições
+        self._status_cache = None               # Último get_status() montado
+        self._status_cache_ts = float('-inf')   # Quando foi montado (time.monotonic)
         
         # Estatísticas detalhadas
         self.entries_count = 0
@@ -342,9 +765,7 @@ class SingleRadarCounter:
         
         # Se não encontrou, procura por dispositivos apropriados
         for port in ports:
-            desc_lower = port.description.lower()
-            if any(term in desc_lower for term in
-                  ['usb', 'serial', 'uart', 'cp210', 'ch340', 'ft232', 'arduino', 'esp32', 'jtag', 'modem']):
+            if _is_radar_port(port.description):
                 logger.warning(f"Porta {self.port} não encontrada, tentando usar {port.device}")
                 return port.device
         
@@ -377,6 +798,9 @@ class SingleRadarCounter:
                 
                 logger.info(f"{self.color} Tentativa {attempt + 1}/{max_attempts}: Conectando à porta {self.port}...")
                 
+                # ✅ Baixa latência: latency_timer de 16ms → 1ms antes de abrir a porta
+                low_latency = _set_low_latency(self.port)
+                
                 self.serial_connection = serial.Serial(
                     port=self.port,
                     baudrate=self.baudrate,
@@ -387,6 +811,15 @@ class SingleRadarCounter:
                     stopbits=serial.STOPBITS_ONE
                 )
                 
+                try:
+                    self.serial_connection.set_low_latency_mode(True)  # pyserial >= 3.5 (Linux)
+                    low_latency = True
+                except (AttributeError, NotImplementedError, ValueError, OSError):
+                    pass
+                
+                if not low_latency:
+                    logger.warning(f"{self.color} ⚠️ Modo baixa latência indisponível em {self.port} (tente: setserial {self.port} low_latency)")
+                
                 # Aguarda estabilização
                 time.sleep(3)
                 
@@ -403,8 +836,8 @@ class SingleRadarCounter:
                 logger.error(f"{self.color} ❌ Erro geral na tentativa {attempt + 1}: {str(e)}")
             
             if attempt < max_attempts - 1:
-                wait_time = (attempt + 1) * 2
-                logger.info(f"{self.color} ⏳ Aguardando {wait_time}s antes da próxima tentativa...")
+                wait_time = _backoff_delay(attempt, base=2.0, cap=30.0)
+                logger.info(f"{self.color} ⏳ Aguardando {wait_time:.1f}s antes da próxima tentativa...")
                 time.sleep(wait_time)
         
         logger.error(f"{self.color} ❌ Falha ao conectar após {max_attempts} tentativas")
@@ -417,9 +850,7 @@ class SingleRadarCounter:
         if not self.connect():
             return False
         
-        self.is_running = True
-        self.receive_thread = threading.Thread(target=self.receive_data_loop, daemon=True)
-        self.receive_thread.start()
+        self._start_threads()
         
         logger.info(f"{self.color} 🚀 Radar {self.area_tipo} iniciado com sucesso!")
         return True
@@ -433,16 +864,28 @@ class SingleRadarCounter:
         if not self.connect():
             return False
         
-        self.is_running = True
-        self.receive_thread = threading.Thread(target=self.receive_data_loop, daemon=True)
-        self.receive_thread.start()
+        self._start_threads()
         
         logger.info(f"{self.color} 🚀 Radar {self.area_tipo} iniciado com planilha separada!")
         return True
 
+    def _start_threads(self):
+        """Inicia as threads de leitura serial, de processamento dos frames e de envio à planilha"""
+        self.is_running = True
+        self._json_q.clear()
+        self._json_ready.clear()
+        self._sheets_stop.clear()
+        self.receive_thread = threading.Thread(target=self.receive_data_loop, daemon=True)
+        self.receive_thread.start()
+        self.process_thread = threading.Thread(target=self.process_loop, daemon=True)
+        self.process_thread.start()
+        self.sheets_thread = threading.Thread(target=self.sheets_writer_loop, daemon=True)
+        self.sheets_thread.start()
+
     def stop(self):
         """Para o radar"""
         self.is_running = False
+        self._json_ready.set()  # Acorda a thread de processamento para encerrar na hora
         
         if self.serial_connection:
             try:
@@ -452,60 +895,138 @@ class SingleRadarCounter:
         
         if self.receive_thread and self.receive_thread.is_alive():
             self.receive_thread.join(timeout=2)
+        if self.process_thread and self.process_thread.is_alive():
+            self.process_thread.join(timeout=2)
+        
+        # Por último a thread de envio: ela guarda no diário local o que ficou no buffer
+        self._sheets_stop.set()
+        if self.sheets_thread and self.sheets_thread.is_alive():
+            self.sheets_thread.join(timeout=2)
         
         logger.info(f"{self.color} 🛑 Radar {self.area_tipo} parado!")
 
+    def _notify_status(self):
+        """Sinaliza ao loop principal uma transição relevante (conexão, planilha)"""
+        self._status_cache_ts = float('-inf')  # Status em cache ficou desatualizado
+        if self.status_event is not None:
+            self.status_event.set()
+
+    def process_loop(self):
+        """Consome os frames enfileirados pela leitura serial (tracking, display e planilha)"""
+        # Afinidade é por thread: cada thread fixa a própria, fora do núcleo do monitoramento
+        if self.cpu_core is not None:
+            _pin_current_thread(_worker_cores())
+        
+        while self.is_running:
+            self._json_ready.wait(timeout=1.0)
+            self._json_ready.clear()
+            while self._json_q and self.is_running:
+                data_json = self._json_q.popleft()
+                try:
+                    self.process_json_data(data_json)
+                except Exception as e:
+                    logger.error(f"Erro ao processar linha JSON: {e}")
+
     def receive_data_loop(self):
         """Loop principal de recebimento de dados com reconexão robusta"""
-        import sys
-        import os
-        buffer = ""
+        buffer = bytearray()  # Bytes recebidos ainda sem '\n' (sem decode/concatenação de str por leitura)
         consecutive_errors = 0
         max_consecutive_errors = 5
         
+        # ✅ Espera por dados no epoll (thread dorme sem segurar o GIL) em vez de polling a cada 10ms
+        selector = selectors.DefaultSelector()
+        registered = None     # Conexão serial atualmente registrada no seletor
+        registered_fd = None  # fd registrado (None → sem fd, usa polling)
+        connected = True      # Último estado sinalizado ao loop principal (só transições acordam o status)
+        
         logger.info(f"{self.color} 🔄 Loop de dados {self.area_tipo} iniciado...")
         
+        # ✅ Raspberry Pi: leitura serial em núcleo próprio, longe do loop de monitoramento
+        if self.cpu_core is not None:
+            _pin_current_thread({self.cpu_core}, niceness=-5)
+        
         while self.is_running:
             try:
                 # Verifica se a conexão está ativa
                 if not self.serial_connection or not self.serial_connection.is_open:
                     logger.warning(f"{self.color} ⚠️ Conexão perdida, tentando reconectar...")
+                    if connected:
+                        connected = False
+                        self._notify_status()
                     if self.connect():
                         consecutive_errors = 0
-                        buffer = ""
+                        buffer.clear()
+                        connected = True
+                        self._notify_status()
                         continue
                     else:
                         consecutive_errors += 1
                         time.sleep(5)
                         continue
                 
-                # Tenta ler dados
-                in_waiting = self.serial_connection.in_waiting or 0
-                data = self.serial_connection.read(in_waiting or 1)
+                # Nova conexão (reconexão): troca o fd registrado no seletor
+                connection = self.serial_connection
+                if registered is not connection:
+                    if registered_fd is not None:
+                        selector.unregister(registered_fd)
+                    try:
+                        registered_fd = connection.fileno()
+                        selector.register(registered_fd, selectors.EVENT_READ)
+                    except (AttributeError, OSError, ValueError):
+                        registered_fd = None  # Sem fd (ex.: Windows): volta ao polling
+                    registered = connection
+                
+                if registered_fd is not None:
+                    if not selector.select(timeout=1.0):
+                        continue  # Nada chegou: volta a checar is_running/conexão
+                    # ✅ Leitura direta do fd: pega tudo o que chegou em uma única syscall
+                    try:
+                        data = os.read(registered_fd, 4096)
+                    except OSError as e:
+                        raise serial.SerialException(f"read failed: {e}") from e
+                    if not data:
+                        raise serial.SerialException("device reports readiness to read but returned no data (device disconnected?)")
+                else:
+                    # Sem fd (ex.: Windows): pyserial bloqueia até fim de linha ou timeout
+                    data = connection.read_until(b'\n')
                 
                 if data:
                     consecutive_errors = 0
-                    text = data.decode('utf-8', errors='ignore')
-                    buffer += text
+                    # O resto anterior não tinha '\n': a busca começa só nos bytes novos
+                    search_from = len(buffer)
+                    buffer += data
                     
-                    if '\n' in buffer:
-                        lines = buffer.split('\n')
-                        buffer = lines[-1]
+                    start = 0
+                    newline = buffer.find(b'\n', search_from)
+                    while newline >= 0:
+                        line_start, line_end = start, newline
+                        start = newline + 1
+                        newline = buffer.find(b'\n', start)
                         
-                        for line in lines[:-1]:
-                            line = line.strip()
-                            if not line or not line.startswith('{'):
+                        # ✅ Filtra pelo 1º byte antes de copiar: frames JSON começam com '{'
+                        # (logs de texto do Arduino e linhas vazias são pulados sem alocação)
+                        if line_start == line_end:
+                            continue
+                        first = buffer[line_start]
+                        if first != 0x7B:  # '{'
+                            if first not in b' \t\r' or not bytes(memoryview(buffer)[line_start:line_end]).lstrip().startswith(b'{'):
                                 continue
-                            
-                            try:
-                                data_json = json.loads(line)
-                                self.process_json_data(data_json)
-                            except json.JSONDecodeError as e:
-                                logger.debug(f"Linha JSON inválida ignorada: {line[:50]}...")
-                            except Exception as e:
-                                logger.error(f"Erro ao processar linha JSON: {e}")
-                
-                time.sleep(0.01)
+                        
+                        # Sem strip(): espaços e '\r' nas pontas são whitespace válido em JSON
+                        line = bytes(memoryview(buffer)[line_start:line_end])
+                        try:
+                            data_json = _json_loads(line)  # orjson/json aceitam bytes UTF-8 diretamente
+                        except ValueError:  # JSON inválido ou bytes não-UTF-8
+                            logger.debug("Linha JSON inválida ignorada: %s...", line[:50])
+                            continue
+                        
+                        # ✅ Só enfileira: envio à planilha/display nunca bloqueiam a leitura da porta
+                        self._json_q.append(data_json)
+                        self._json_ready.set()
+                    
+                    # Descarta as linhas consumidas de uma vez (uma compactação por leitura)
+                    if start:
+                        del buffer[:start]
                 
             except serial.SerialException as e:
                 consecutive_errors += 1
@@ -542,15 +1063,17 @@ class SingleRadarCounter:
                     logger.warning(f"{self.color} ⚠️ Muitos erros consecutivos, pausando...")
                     time.sleep(10)
                     consecutive_errors = 0
+        
+        selector.close()
 
     def convert_timestamp(self, timestamp_ms):
         """Converte timestamp de milissegundos para formato brasileiro"""
-        try:
-            dt = datetime.now()
-            return dt.strftime('%d/%m/%Y %H:%M:%S')
-        except Exception as e:
-            logger.debug(f"Erro na conversão de timestamp: {e}")
-            return datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+        # Horário local do Raspberry (o timestamp do Arduino é relativo ao boot);
+        # a string só é refeita quando muda o segundo
+        second = int(time.time())
+        if second != self._ts_cache[0]:
+            self._ts_cache = (second, time.strftime('%d/%m/%Y %H:%M:%S', time.localtime(second)))
+        return self._ts_cache[1]
 
     def format_duration(self, duration_ms):
         """Formata duração em milissegundos para formato legível"""
@@ -571,32 +1094,30 @@ class SingleRadarCounter:
 
     def update_people_count(self, person_count, active_people):
         """Sistema CORRIGIDO de tracking para eventos - lógica precisa de entrada/saída"""
-        current_time = time.time()
+        current_time = time.monotonic()
         
         current_people_dict = {}
         
+        # ✅ CALCULA ZONAS E DISTÂNCIAS da área para todas as pessoas do frame de uma vez (coordenadas x,y)
+        if active_people:
+            count = len(active_people)
+            xs = np.fromiter((person.get('x_pos', 0) for person in active_people), dtype=np.float64, count=count)
+            ys = np.fromiter((person.get('y_pos', 0) for person in active_people), dtype=np.float64, count=count)
+            zones = self.zone_manager.get_zones_bulk(xs, ys)
+            distances = np.hypot(xs, ys).tolist()
+            for person, zone, calc_distance in zip(active_people, zones, distances):
+                person["zone"] = zone                    # Atualiza o objeto pessoa com a zona correta
+                person["calc_distance"] = calc_distance  # Distância (x,y) reaproveitada no display
+        
         for i, person in enumerate(active_people):
-            x_pos = person.get('x_pos', 0)
-            y_pos = person.get('y_pos', 0) 
             distance = person.get('distance_smoothed', person.get('distance_raw', 0))
-            
-            # ✅ CALCULA ZONA ESPECÍFICA DA ÁREA usando coordenadas x,y
-            zone = self.zone_manager.get_zone(x_pos, y_pos)
-            person["zone"] = zone  # Atualiza o objeto pessoa com a zona correta
+            zone = person["zone"]
             
             # ID baseado na posição arredondada (estável para pessoa parada)
             stable_id = f"P_{self.area_tipo}_{zone}_{distance:.1f}_{i}"
             
-            # Procura se já existe pessoa similar (mesma zona, distância similar)
-            found_existing = None
-            for existing_id, existing_person in self.current_people.items():
-                existing_dist = existing_person.get('distance_smoothed', 0)
-                existing_zone = existing_person.get('zone', '')
-                
-                if (existing_zone == zone and 
-                    abs(existing_dist - distance) < 0.3):
-                    found_existing = existing_id
-                    break
+            # Procura se já existe pessoa similar (mesma zona, distância similar) - máscara vetorizada
+            found_existing = self._tracked.first_match(zone, distance, 0.3)
             
             if found_existing:
                 current_people_dict[found_existing] = person
@@ -610,18 +1131,11 @@ class SingleRadarCounter:
         new_entries = []
         for person_id, person_info in current_people_dict.items():
             if person_id not in self.current_people:
-                is_really_new = True
-                for old_id, old_person in self.previous_people.items():
-                    old_zone = old_person.get('zone', '')
-                    old_dist = old_person.get('distance_smoothed', 0)
-                    new_zone = person_info.get('zone', '')
-                    new_dist = person_info.get('distance_smoothed', 0)
-                    
-                    if (old_zone == new_zone and 
-                        abs(old_dist - new_dist) < 0.5 and
-                        (current_time - old_person.get('last_seen', 0)) < 2.0):
-                        is_really_new = False
-                        break
+                # Reapareceu há pouco (mesma zona, distância próxima, visto < 2s)? Então não é entrada
+                is_really_new = self._previous_tracked.first_match(
+                    person_info.get('zone', ''), person_info.get('distance_smoothed', 0), 0.5,
+                    now=current_time, max_age=2.0
+                ) is None
                 
                 if is_really_new:
                     new_entries.append(person_id)
@@ -630,7 +1144,7 @@ class SingleRadarCounter:
                     self.unique_people_today.add(person_id)
                     zone = person_info.get('zone', 'DESCONHECIDA')
                     dist = person_info.get('distance_smoothed', 0)
-                    logger.info(f"🆕 ENTRADA {self.area_tipo}: {zone} {dist:.1f}m (Total: {self.total_people_detected})")
+                    logger.info("🆕 ENTRADA %s: %s %.1fm (Total: %d)", self.area_tipo, zone, dist, self.total_people_detected)
         
         # Detecta SAÍDAS REAIS
         exits = []
@@ -642,17 +1156,20 @@ class SingleRadarCounter:
                     self.exits_count += 1
                     zone = person_info.get('zone', 'DESCONHECIDA')
                     dist = person_info.get('distance_smoothed', 0)
-                    logger.info(f"🚪 SAÍDA {self.area_tipo}: {zone} {dist:.1f}m")
+                    logger.info("🚪 SAÍDA %s: %s %.1fm", self.area_tipo, zone, dist)
         
         # Atualiza estado
-        self.previous_people = self.current_people.copy()
+        # Troca de referência: o dict antigo não é mais alterado, então não precisa de cópia
+        self.previous_people = self.current_people
         self.current_people = current_people_dict
+        self._previous_tracked = self._tracked
+        self._tracked = TrackState(current_people_dict)
         
         # Atualiza máximo simultâneo
         current_simultaneous = len(current_people_dict)
         if current_simultaneous > self.max_simultaneous_people:
             self.max_simultaneous_people = current_simultaneous
-            logger.info(f"📊 NOVO MÁXIMO {self.area_tipo}: {self.max_simultaneous_people} pessoas")
+            logger.info("📊 NOVO MÁXIMO %s: %d pessoas", self.area_tipo, self.max_simultaneous_people)
         
         self.last_update_time = current_time
 
@@ -669,92 +1186,31 @@ class SingleRadarCounter:
             # Atualiza contadores locais
             self.update_people_count(person_count, active_people)
 
-            # ✅ LIMPA TERMINAL IGUAL AO SANTA CRUZ (apenas aqui)
-            os.system('clear')
-
-            # ✅ DISPLAY IGUAL AO SANTA CRUZ + área específica
-            print(f"\n{self.color} ═══ GRAVATÁ {self.area_tipo} - TRACKING AVANÇADO ═══")
-            print(f"⏰ {formatted_timestamp}")
-            print(f"📡 {radar_id} | 👥 ATIVAS: {person_count}")
-            print(f"🎯 TOTAL DETECTADAS: {self.total_people_detected} | 📊 MÁXIMO SIMULTÂNEO: {self.max_simultaneous_people}")
-            print(f"🔄 ENTRADAS: {self.entries_count} | 🚪 SAÍDAS: {self.exits_count}")
-            print(f"🆔 PESSOAS ÚNICAS: {len(self.unique_people_today)}")
-
-            # Mostra duração da sessão (igual Santa Cruz)
-            session_duration = datetime.now() - self.session_start_time
-            duration_str = self.format_duration(session_duration.total_seconds() * 1000)
-            print(f"⏱️ SESSÃO: {duration_str}")
-
-            # ✅ STATUS DO ENVIO IGUAL AO SANTA CRUZ
-            pending_count = len(self.pending_data)
-            time_since_last_send = time.time() - self.last_sheets_write
-            next_send_in = max(0, self.sheets_write_interval - time_since_last_send)
-            if pending_count > 0:
-                print(f"📋 BUFFER: {pending_count} linhas | ⏳ Próximo envio em: {next_send_in:.0f}s")
-            else:
-                print(f"📋 PLANILHA: Sincronizada ✅")
-
-            if active_people and len(active_people) > 0:
-                # ✅ TABELA COM DEBUG DE COORDENADAS
-                print(f"\n👥 PESSOAS DETECTADAS AGORA ({len(active_people)}):")
-                if self.area_tipo == 'INTERNA':
-                    print(f"{'Ativação':<15} {'Dist(m)':<7} {'X,Y':<12} {'Conf%':<5} {'Status':<8} {'Desde':<8}")
-                else:
-                    print(f"{'Zona':<15} {'Dist(m)':<7} {'X,Y':<12} {'Conf%':<5} {'Status':<8} {'Desde':<8}")
-                print("-" * 70)
-
-                current_time = time.time()
-                for i, person in enumerate(active_people):
-                    confidence = person.get("confidence", 0)
-                    distance_smoothed = person.get("distance_smoothed", person.get("distance_raw", 0))
-                    x_pos = person.get("x_pos", 0)
-                    y_pos = person.get("y_pos", 0)
-                    stationary = person.get("stationary", False)
-
-                    # ✅ CALCULA ZONA MELHORADA (com debug detalhado)
-                    zone = self.zone_manager.get_zone(x_pos, y_pos)
-                    person["zone"] = zone  # Atualiza o objeto pessoa com a zona correta
-
-                    # 🔍DEBUG DETALHADO: Mostra todo o processo de cálculo
-                    calculated_distance = self.zone_manager.get_distance(x_pos, y_pos)
-                    logger.info(f"🔍 DEBUG {self.area_tipo}: X={x_pos:.2f}, Y={y_pos:.2f}")
-                    logger.info(f"   📏 Distância calculada: {calculated_distance:.2f}m (Arduino: {distance_smoothed:.2f}m)")
-                    logger.info(f"   🎯 Zona determinada: {zone}")
-                    
-                    # Mostra qual lógica foi aplicada
-                    if x_pos < -0.8:
-                        logger.info(f"   📍 Lógica: LADO ESQUERDO (X < -0.8)")
-                    elif x_pos > 0.8:
-                        logger.info(f"   📍 Lógica: LADO DIREITO (X > 0.8)")
-                    else:
-                        logger.info(f"   📍 Lógica: CENTRO (-0.8 ≤ X ≤ 0.8)")
-
-                    # Encontra ID da nossa lógica interna (igual Santa Cruz)
-                    our_person_id = None
-                    for internal_id, internal_person in self.current_people.items():
-                        if (abs(internal_person.get('distance_smoothed', 0) - distance_smoothed) < 0.1 and
-                            internal_person.get('zone', '') == zone):
-                            our_person_id = internal_id
-                            break
-
-                    # Calcula tempo desde primeira detecção (nossa lógica)
-                    if our_person_id and our_person_id in self.current_people:
-                        first_seen = self.current_people[our_person_id].get('first_seen', current_time)
-                        time_in_area = current_time - first_seen
-                        time_str = f"{time_in_area:.0f}s" if time_in_area < 60 else f"{time_in_area/60:.1f}m"
-                    else:
-                        time_str = "novo"
-
-                    status = "Parado" if stationary else "Móvel"
-                    pos_str = f"{x_pos:.2f},{y_pos:.2f}"  # ✅ Mais precisão nas coordenadas
+            # ✅ Confiança/distância do frame em arrays: médias e contagens numa redução só
+            count = len(active_people)
+            confidences = np.fromiter((p.get("confidence", 0) for p in active_people), dtype=np.float64, count=count)
+            distances = np.fromiter((p.get('distance_smoothed', p.get('distance_raw', 0)) for p in active_people),
+                                    dtype=np.float64, count=count)
+            high_confidence = int(np.count_nonzero(confidences >= 70))
 
-                    zone_desc = self.zone_manager.get_zone_description(zone)[:14]
-                    print(f"{zone_desc:<15} {distance_smoothed:<7.2f} {pos_str:<12} {confidence:<5}% {status:<8} {time_str:<8}")
+            # ✅ DISPLAY IGUAL AO SANTA CRUZ (desligado em modo headless)
+            # Frame idêntico ao último exibido (< DISPLAY_REFRESH s): mantém a tela como está
+            if self.verbose_display:
+                frame_key = (person_count, tuple(sorted(
+                    (round(p.get('x_pos', 0), 2), round(p.get('y_pos', 0), 2)) for p in active_people
+                )))
+                now = time.monotonic()
+                if frame_key != self._last_frame_key or now - self._last_display >= DISPLAY_REFRESH:
+                    self.render_display(radar_id, formatted_timestamp, person_count, active_people, high_confidence)
+                    self._last_frame_key = frame_key
+                    self._last_display = now
 
-                # ✅ ENVIA DADOS IGUAL AO SANTA CRUZ (formato de 9 campos)
-                if self.gsheets_manager:
+            # ✅ ENVIA DADOS IGUAL AO SANTA CRUZ (formato de 9 campos)
+            if self.gsheets_manager:
+                if active_people:
                     # Calcula dados agregados
-                    avg_confidence = sum(p.get("confidence", 0) for p in active_people) / len(active_people)
+                    avg_confidence = float(confidences.mean())
+                    avg_distance = float(distances.mean())
                     # ✅ COLETA ZONAS JÁ CORRIGIDAS (calculadas pelo ZoneManager)
                     zones_detected = list(set(p.get("zone", "N/A") for p in active_people))
                     zones_str = ",".join(sorted(zones_detected))
@@ -771,108 +1227,295 @@ class SingleRadarCounter:
                     else:
                         person_description = "Multidão"
 
-                    # ✅ FORMATO SANTA CRUZ (9 campos) - planilha separada por área
-                    row = [
+                    # ✅ FORMATO SANTA CRUZ (9 campos + samples) - planilha separada por área
+                    # Valores numéricos vão como números: com RAW o Sheets não precisa interpretar texto
+                    # Linha é uma tupla imutável (snapshot único, sem lista intermediária)
+                    row = (
                         radar_id,                          # 1. radar_id (simples, cada área tem planilha própria)
                         formatted_timestamp,               # 2. timestamp
                         len(active_people),                # 3. person_count (real detectadas agora)
                         person_description,                # 4. person_id (descrição profissional)
                         zones_str,                         # 5. zone (todas as zonas ordenadas)
-                        f"{sum(p.get('distance_smoothed', p.get('distance_raw', 0)) for p in active_people) / len(active_people):.1f}",  # 6. distance (média)
-                        f"{avg_confidence:.0f}",           # 7. confidence (média)
+                        round(avg_distance, 1),            # 6. distance (média)
+                        round(avg_confidence),             # 7. confidence (média)
                         self.total_people_detected,        # 8. total_detected (nossa contagem real)
                         self.max_simultaneous_people       # 9. max_simultaneous (nosso máximo real)
-                    ]
-                    self.pending_data.append(row)
-
-                print(f"\n💡 DETECTANDO {len(active_people)} pessoa(s) SIMULTANEAMENTE")
-
-                # ✅ ESTATÍSTICAS POR ZONA IGUAL AO SANTA CRUZ
-                zone_stats = {}
-                high_confidence = 0
-                for person in active_people:
-                    zone = person.get("zone", "N/A")  # Zona já foi corrigida acima
-                    zone_stats[zone] = zone_stats.get(zone, 0) + 1
-                    if person.get("confidence", 0) >= 70:
-                        high_confidence += 1
-
-                if zone_stats:
-                    if self.area_tipo == 'INTERNA':
-                        print("📊 DISTRIBUIÇÃO POR ATIVAÇÃO:")
-                    else:
-                        print("📊 DISTRIBUIÇÃO POR ZONA:")
-                    for zone, count in zone_stats.items():
-                        zone_desc = self.zone_manager.get_zone_description(zone)
-                        print(f"   • {zone_desc}: {count} pessoa(s)")
-                    print()
-
-                print(f"✅ QUALIDADE: {high_confidence}/{len(active_people)} com alta confiança (≥70%)")
-
-            else:
-                print(f"\n👻 Nenhuma pessoa detectada no momento.")
-
-                # ✅ ENVIA DADOS ZERADOS IGUAL AO SANTA CRUZ
-                if self.gsheets_manager and len(self.previous_people) > 0:
-                    row = [
+                    )
+                    self._buffer_row(row)
+                elif len(self.previous_people) > 0:
+                    # ✅ ENVIA DADOS ZERADOS IGUAL AO SANTA CRUZ
+                    row = (
                         radar_id,                          # 1. radar_id (simples, cada área tem planilha própria)
                         formatted_timestamp,               # 2. timestamp
                         0,                                 # 3. person_count (zero)
                         "Area_Vazia",                      # 4. person_id (indicador)
                         "VAZIA",                           # 5. zone 
-                        "0",                               # 6. distance
-                        "0",                               # 7. confidence
+                        0,                                 # 6. distance
+                        0,                                 # 7. confidence
                         self.total_people_detected,        # 8. total_detected (nossa contagem real)
                         self.max_simultaneous_people       # 9. max_simultaneous (nosso máximo real)
-                    ]
-                    self.pending_data.append(row)
-
-            print("\n" + "═" * 60)
-            print("🎯 SISTEMA ROBUSTO: Detecta entradas/saídas precisamente")
-            print("⚡ Pressione Ctrl+C para encerrar | Tracking Avançado Ativo")
-
-            # ✅ ENVIA DADOS IGUAL AO SANTA CRUZ
-            self.send_pending_data_to_sheets()
+                    )
+                    self._buffer_row(row)
 
         except Exception as e:
             logger.error(f"Erro ao processar dados JSON {self.area_tipo}: {e}")
 
+    def render_display(self, radar_id, formatted_timestamp, person_count, active_people, high_confidence):
+        """Monta a tela inteira e escreve de uma vez (uma única escrita no terminal)"""
+        lines = [
+            f"\n{self.color} ═══ GRAVATÁ {self.area_tipo} - TRACKING AVANÇADO ═══",
+            f"⏰ {formatted_timestamp}",
+            f"📡 {radar_id} | 👥 ATIVAS: {person_count}",
+            f"🎯 TOTAL DETECTADAS: {self.total_people_detected} | 📊 MÁXIMO SIMULTÂNEO: {self.max_simultaneous_people}",
+            f"🔄 ENTRADAS: {self.entries_count} | 🚪 SAÍDAS: {self.exits_count}",
+            f"🆔 PESSOAS ÚNICAS: {len(self.unique_people_today)}",
+        ]
+
+        # Mostra duração da sessão (igual Santa Cruz)
+        current_time = time.monotonic()  # Um único relógio para toda a tela
+        session_duration = current_time - self.session_start_mono
+        duration_str = self.format_duration(session_duration * 1000)
+        lines.append(f"⏱️ SESSÃO: {duration_str}")
+
+        # ✅ STATUS DO ENVIO IGUAL AO SANTA CRUZ
+        pending_count = len(self.pending_data)
+        time_since_last_send = current_time - self.last_sheets_write
+        next_send_in = max(0, self.sheets_write_interval - time_since_last_send)
+        if pending_count > 0:
+            lines.append(f"📋 BUFFER: {pending_count} linhas | ⏳ Próximo envio em: {next_send_in:.0f}s")
+        else:
+            lines.append(f"📋 PLANILHA: Sincronizada ✅")
+
+        if active_people:
+            # ✅ TABELA COM DEBUG DE COORDENADAS
+            lines.append(f"\n👥 PESSOAS DETECTADAS AGORA ({len(active_people)}):")
+            if self.area_tipo == 'INTERNA':
+                lines.append(f"{'Ativação':<15} {'Dist(m)':<7} {'X,Y':<12} {'Conf%':<5} {'Status':<8} {'Desde':<8}")
+            else:
+                lines.append(f"{'Zona':<15} {'Dist(m)':<7} {'X,Y':<12} {'Conf%':<5} {'Status':<8} {'Desde':<8}")
+            lines.append("-" * 70)
+
+            debug = logger.isEnabledFor(logging.DEBUG)
+            for person in active_people:
+                confidence = person.get("confidence", 0)
+                distance_smoothed = person.get("distance_smoothed", person.get("distance_raw", 0))
+                x_pos = person.get("x_pos", 0)
+                y_pos = person.get("y_pos", 0)
+                stationary = person.get("stationary", False)
+
+                # ✅ Zona já calculada (em lote) por update_people_count
+                zone = person["zone"]
+
+                # 🔍DEBUG DETALHADO: Mostra todo o processo de cálculo (só com DEBUG ativo)
+                if debug:
+                    logger.debug("🔍 DEBUG %s: X=%.2f, Y=%.2f", self.area_tipo, x_pos, y_pos)
+                    logger.debug("   📏 Distância calculada: %.2fm (Arduino: %.2fm)", person["calc_distance"], distance_smoothed)
+                    logger.debug("   🎯 Zona determinada: %s", zone)
+                    if x_pos < -0.8:
+                        logger.debug("   📍 Lógica: LADO ESQUERDO (X < -0.8)")
+                    elif x_pos > 0.8:
+                        logger.debug("   📍 Lógica: LADO DIREITO (X > 0.8)")
+                    else:
+                        logger.debug("   📍 Lógica: CENTRO (-0.8 ≤ X ≤ 0.8)")
+
+                # Encontra ID da nossa lógica interna (igual Santa Cruz)
+                our_person_id = self._tracked.first_match(zone, distance_smoothed, 0.1)
+
+                # Calcula tempo desde primeira detecção (nossa lógica)
+                if our_person_id and our_person_id in self.current_people:
+                    first_seen = self.current_people[our_person_id].get('first_seen', current_time)
+                    time_in_area = current_time - first_seen
+                    time_str = f"{time_in_area:.0f}s" if time_in_area < 60 else f"{time_in_area/60:.1f}m"
+                else:
+                    time_str = "novo"
+
+                status = "Parado" if stationary else "Móvel"
+                pos_str = f"{x_pos:.2f},{y_pos:.2f}"  # ✅ Mais precisão nas coordenadas
+
+                zone_desc = self.zone_manager.get_zone_description(zone)[:14]
+                lines.append(f"{zone_desc:<15} {distance_smoothed:<7.2f} {pos_str:<12} {confidence:<5}% {status:<8} {time_str:<8}")
+
+            lines.append(f"\n💡 DETECTANDO {len(active_people)} pessoa(s) SIMULTANEAMENTE")
+
+            # ✅ ESTATÍSTICAS POR ZONA IGUAL AO SANTA CRUZ
+            zone_stats = {}
+            for person in active_people:
+                zone = person.get("zone", "N/A")  # Zona já foi corrigida acima
+                zone_stats[zone] = zone_stats.get(zone, 0) + 1
+
+            if zone_stats:
+                if self.area_tipo == 'INTERNA':
+                    lines.append("📊 DISTRIBUIÇÃO POR ATIVAÇÃO:")
+                else:
+                    lines.append("📊 DISTRIBUIÇÃO POR ZONA:")
+                for zone, count in zone_stats.items():
+                    zone_desc = self.zone_manager.get_zone_description(zone)
+                    lines.append(f"   • {zone_desc}: {count} pessoa(s)")
+                lines.append("")
+
+            lines.append(f"✅ QUALIDADE: {high_confidence}/{len(active_people)} com alta confiança (≥70%)")
+
+        else:
+            lines.append(f"\n👻 Nenhuma pessoa detectada no momento.")
+
+        lines.append("\n" + "═" * 60)
+        lines.append("🎯 SISTEMA ROBUSTO: Detecta entradas/saídas precisamente")
+        lines.append("⚡ Pressione Ctrl+C para encerrar | Tracking Avançado Ativo")
+
+        # ✅ Limpa a tela via ANSI (sem fork de /bin/clear) e escreve tudo em uma chamada
+        sys.stdout.write(_CLEAR_SCREEN + "\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+    def sheets_writer_loop(self):
+        """Thread de envio: dorme até o próximo envio (intervalo ou backoff) e envia o buffer"""
+        if self.cpu_core is not None:
+            _pin_current_thread(_worker_cores())
+        # Primeiro envio defasado: as duas áreas não disputam a quota no mesmo instante
+        timeout = self.sheets_write_interval + self.sheets_flush_offset
+        while not self._sheets_stop.wait(timeout=timeout):
+            self.send_pending_data_to_sheets()
+            due = max(self.last_sheets_write + self.sheets_write_interval, self.sheets_retry_at) - time.monotonic()
+            timeout = due if due > 0 else self.sheets_write_interval
+        
+        # ✅ Encerrando: o que não foi enviado fica no diário local para a próxima execução
+        self._journal_pending_data()
+
     def send_pending_data_to_sheets(self):
-        """✅ ENVIA DADOS IGUAL AO SANTA CRUZ (30s, 10 linhas máx, 0.5s entre linhas)"""
+        """✅ ENVIA DADOS IGUAL AO SANTA CRUZ (a cada 30s, todas as linhas pendentes em lote único)"""
+        journal_ids = []
+        batch = ()
         try:
-            current_time = time.time()
+            current_time = time.monotonic()
             
             # ✅ IGUAL SANTA CRUZ: Verifica se já passou tempo suficiente
             if (current_time - self.last_sheets_write) < self.sheets_write_interval:
                 return  # Ainda não é hora de enviar
             
+            # Torna visíveis as linhas descartadas pelo buffer limitado
+            with self._pending_lock:
+                evicted, self.pending_evicted = self.pending_evicted, 0
+            if evicted:
+                logger.warning("⚠️ Buffer %s cheio: %d linhas antigas descartadas", self.area_tipo, evicted)
+            
+            # Após falhas, respeita o backoff exponencial antes de tentar de novo
+            if current_time < self.sheets_retry_at:
+                return
+            
+            if not self.gsheets_manager:
+                return
+            
+            # ✅ Linhas guardadas no diário local (falhas anteriores) vão primeiro, preservando a ordem
+            journal_rows = []
+            if self.journal:
+                journal_ids, journal_rows = self.journal.drain(self.radar_id, JOURNAL_DRAIN_BATCH)
+            
+            # ✅ Retira o buffer inteiro de uma vez: o processamento segue enchendo um buffer novo
+            batch = self._take_pending()
+            
+            # Diário ainda com linhas: as novas entram no fim dele (FIFO estrito) e só o diário é enviado,
+            # senão linhas novas chegariam à planilha antes do restante do diário (além de JOURNAL_DRAIN_BATCH)
+            if journal_rows and batch:
+                self._journal_rows(batch)
+                batch = ()
+            
             # Se não há dados pendentes, não faz nada
-            if not self.pending_data or not self.gsheets_manager:
+            if not batch and not journal_rows:
                 return
             
-            # ✅ IGUAL SANTA CRUZ: Pega apenas os dados mais recentes (máximo 10 linhas por vez)
-            data_to_send = self.pending_data[-10:] if len(self.pending_data) > 10 else self.pending_data
+            # ✅ Uma única requisição: diário ou buffer (nada é descartado)
+            data_to_send = journal_rows or list(batch)
             
             # ✅ IGUAL SANTA CRUZ: Envia em lote
             if data_to_send:
-                logger.info(f"📊 Enviando {len(data_to_send)} linhas {self.area_tipo} para Google Sheets...")
+                logger.info("📊 Enviando %d linhas %s para Google Sheets...", len(data_to_send), self.area_tipo)
                 
-                # ✅ IGUAL SANTA CRUZ: Envia todas as linhas de uma vez (batch)
-                for row in data_to_send:
-                    self.gsheets_manager.worksheet.append_row(row)
-                    time.sleep(0.5)  # ✅ IGUAL SANTA CRUZ: 0.5s entre linhas
+                # ✅ Envia todas as linhas em uma única requisição (batch)
+                # Orçamento: retries nunca ocupam mais que metade do intervalo de envio
+                if not self.gsheets_manager.append_rows_batch(data_to_send, budget=self.sheets_write_interval / 2):
+                    self._journal_rows(batch)
+                    # Quota/breaker: backoff exponencial com base maior que a das falhas transitórias
+                    self.sheets_failures += 1
+                    delay = _backoff_delay(self.sheets_failures - 1, base=30.0, cap=300.0)
+                    self.sheets_retry_at = current_time + delay
+                    logger.warning("🔌 Planilha %s em pausa (circuit breaker/quota) - dados guardados localmente, "
+                                   "nova tentativa em %.0fs", self.area_tipo, delay)
+                    self._notify_status()
+                    return
+                batch = ()  # Enviado: não volta mais ao buffer nem ao diário
                 
-                logger.info(f"✅ {len(data_to_send)} linhas {self.area_tipo} enviadas com sucesso!")
+                if journal_ids:
+                    self.journal.delete(journal_ids)
+                
+                logger.info("✅ %d linhas %s enviadas com sucesso!", len(data_to_send), self.area_tipo)
                 
                 # Atualiza controles
                 self.last_sheets_write = current_time
-                self.pending_data = []  # Limpa dados enviados
+                if self.sheets_failures:
+                    self.sheets_failures = 0
+                    self._notify_status()  # Planilha recuperada
                 
         except Exception as e:
             logger.error(f"❌ Erro ao enviar dados {self.area_tipo}: {e}")
-            # ✅ IGUAL SANTA CRUZ: Em caso de erro, mantém dados para próxima tentativa
-            if "quota" in str(e).lower() or "429" in str(e):
-                logger.warning("⚠️ Quota excedida - aumentando intervalo para 60s")
-                self.sheets_write_interval = 60.0
+            # ✅ Em caso de erro, guarda os dados no diário local para a próxima tentativa
+            self._journal_rows(batch)
+            # Backoff exponencial com jitter (quota estourada é tratada acima, com base maior)
+            self.sheets_failures += 1
+            self._notify_status()
+            delay = _backoff_delay(self.sheets_failures - 1, base=5.0, cap=300.0)
+            self.sheets_retry_at = time.monotonic() + delay
+            logger.warning("⚠️ Nova tentativa de envio %s em %.0fs", self.area_tipo, delay)
+
+    def _buffer_row(self, row):
+        """Adiciona linha ao buffer; com o buffer cheio a mais antiga é descartada
+        
+        Leitura idêntica à anterior (ignorando o timestamp) não gera linha nova: atualiza o
+        timestamp (última vez vista) e incrementa a coluna samples da última linha.
+        """
+        with self._pending_lock:
+            pending = self.pending_data
+            if pending:
+                last = pending[-1]
+                if last[0] == row[0] and last[2:9] == row[2:9]:
+                    pending[-1] = row + (last[9] + 1,)
+                    return
+            
+            if len(pending) == pending.maxlen:
+                self.pending_evicted += 1
+            pending.append(row + (1,))
+
+    def _take_pending(self):
+        """Retira o buffer em memória para envio, deixando um buffer novo no lugar"""
+        with self._pending_lock:
+            batch = self.pending_data
+            if batch:
+                self.pending_data = deque(maxlen=PENDING_DATA_MAXLEN)
+            return batch
+
+    def _restore_pending(self, batch):
+        """Devolve ao início do buffer linhas retiradas que não puderam ser enviadas nem guardadas"""
+        with self._pending_lock:
+            restored = deque(batch, maxlen=PENDING_DATA_MAXLEN)
+            overflow = len(restored) + len(self.pending_data) - PENDING_DATA_MAXLEN
+            if overflow > 0:
+                self.pending_evicted += overflow  # Com o buffer cheio, as mais antigas saem
+            restored.extend(self.pending_data)
+            self.pending_data = restored
+
+    def _journal_rows(self, batch):
+        """Guarda no diário local (SQLite) linhas retiradas do buffer; sem diário, voltam ao buffer"""
+        if not batch:
+            return
+        if self.journal:
+            try:
+                self.journal.enqueue(self.radar_id, batch)
+                return
+            except sqlite3.Error as e:
+                logger.error(f"❌ Erro ao gravar diário local {self.area_tipo}: {e}")
+        self._restore_pending(batch)
+
+    def _journal_pending_data(self):
+        """Move o buffer em memória para o diário local (SQLite), se configurado"""
+        self._journal_rows(self._take_pending())
 
     def get_current_count(self):
         return len(self.current_people)
@@ -881,7 +1524,11 @@ class SingleRadarCounter:
         return self.total_people_detected
 
     def get_status(self):
-        """Retorna status completo do radar"""
+        """Retorna status completo do radar (reaproveitado por STATUS_CACHE_TTL segundos)"""
+        now = time.monotonic()
+        if now - self._status_cache_ts < STATUS_CACHE_TTL:
+            return self._status_cache
+        
         status = {
             'id': self.radar_id,
             'name': self.radar_name,
@@ -897,16 +1544,20 @@ class SingleRadarCounter:
             'exits_count': self.exits_count,
             'unique_people': len(self.unique_people_today),
             'people_in_area': len(self.current_people),
-            'session_duration': (datetime.now() - self.session_start_time).total_seconds()
+            'session_duration': now - self.session_start_mono
         }
         status['timestamp'] = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
         status['last_debug'] = getattr(self, 'last_debug', '')
+        self._status_cache = status
+        self._status_cache_ts = now
         return status
 
 class GravataDualRadarSystem:
     def __init__(self):
         self.radars = []
         self.is_running = False
+        # ✅ Radares sinalizam transições (conexão, planilha) e o loop principal acorda na hora
+        self.status_event = threading.Event()
 
     def detect_available_ports(self):
         """Detecta portas seriais disponíveis"""
@@ -920,11 +1571,17 @@ class GravataDualRadarSystem:
         
         return available_ports
 
-    def initialize(self):
-        """Inicializa o sistema dual radar com planilhas separadas"""
+    def initialize(self, ports=None):
+        """Inicializa o sistema dual radar com planilhas separadas
+        
+        ports: lista de portas já enumerada pelo chamador; se omitida, as portas são detectadas aqui
+        """
         try:
-            # Detecta portas disponíveis
-            available_ports = self.detect_available_ports()
+            # Reaproveita a enumeração do chamador, evitando uma segunda varredura
+            if ports is not None:
+                available_ports = list(ports)
+            else:
+                available_ports = self.detect_available_ports()
             
             if len(available_ports) < 2:
                 logger.error(f"❌ Necessário 2 portas, encontradas {len(available_ports)}")
@@ -950,8 +1607,11 @@ class GravataDualRadarSystem:
                 logger.error(f"❌ Credenciais não encontradas: {credentials_file}")
                 return False
             
+            # ✅ Diário local compartilhado: nenhuma linha se perde quando o Sheets está indisponível
+            journal = RowJournal(os.path.join(script_dir, JOURNAL_FILE))
+            
             # ✅ INICIALIZA RADARES COM PLANILHAS SEPARADAS
-            for config in RADAR_CONFIGS:
+            for i, config in enumerate(RADAR_CONFIGS):
                 # Cada radar terá seu próprio GoogleSheetsManager
                 gsheets_manager = GoogleSheetsManager(
                     credentials_file,
@@ -961,6 +1621,11 @@ class GravataDualRadarSystem:
                 
                 radar = SingleRadarCounter(config)
                 radar.gsheets_manager = gsheets_manager  # ✅ Atribui planilha específica
+                radar.cpu_core = i + 1                   # Núcleo 0 fica com o loop principal
+                radar.journal = journal
+                radar.status_event = self.status_event
+                # ✅ Envios intercalados: cada área escreve numa fração diferente do intervalo
+                radar.sheets_flush_offset = i * radar.sheets_write_interval / len(RADAR_CONFIGS)
                 self.radars.append(radar)
                 
                 logger.info(f"✅ {config['area_tipo']}: Planilha {config['spreadsheet_id'][:8]}...")
@@ -968,8 +1633,8 @@ class GravataDualRadarSystem:
             logger.info("✅ Sistema Dual Radar Gravatá inicializado com planilhas separadas!")
             return True
             
-        except Exception as e:
-            logger.error(f"❌ Erro na inicialização: {e}")
+        except Exception:
+            logger.exception("❌ Erro na inicialização")
             return False
 
     def start(self):
@@ -993,16 +1658,17 @@ class GravataDualRadarSystem:
             logger.info("🚀 Sistema Dual Radar Gravatá ATIVO com planilhas separadas!")
             return True
             
-        except Exception as e:
-            logger.error(f"❌ Erro ao iniciar sistema: {e}")
+        except Exception:
+            logger.exception("❌ Erro ao iniciar sistema")
             return False
 
     def stop(self):
         """Para todos os radares"""
         self.is_running = False
         
-        for radar in self.radars:
-            radar.stop()
+        # ✅ Para os radares em paralelo: o tempo total é o do radar mais lento, não a soma
+        with ThreadPoolExecutor(max_workers=len(self.radars) or 1) as executor:
+            list(executor.map(lambda radar: radar.stop(), self.radars))
         
         logger.info("🛑 Sistema Dual Radar Gravatá parado!")
 
@@ -1019,37 +1685,113 @@ class GravataDualRadarSystem:
         return status
 
 def list_available_ports():
-    """Lista todas as portas seriais disponíveis"""
+    """Lista as portas seriais disponíveis, priorizando chips USB-serial conhecidos (VID)"""
     ports = list(serial.tools.list_ports.comports())
     
-    print("\n🔍 DIAGNÓSTICO DE PORTAS SERIAIS - GRAVATÁ DUAL")
-    print("=" * 60)
+    # ✅ Monta todo o diagnóstico em memória e escreve no stdout de uma só vez
+    out = ["\n🔍 DIAGNÓSTICO DE PORTAS SERIAIS - GRAVATÁ DUAL\n", "=" * 60, "\n"]
     
     if not ports:
-        print("❌ Nenhuma porta serial encontrada!")
+        out.append("❌ Nenhuma porta serial encontrada!\n")
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
         return []
     
-    print(f"✅ {len(ports)} porta(s) encontrada(s):")
+    # ✅ Separa pelo VID USB: portas de radar conhecidas primeiro, demais depois
+    preferred = [port for port in ports if port.vid in KNOWN_RADAR_VIDS]
+    others = [port for port in ports if port.vid not in KNOWN_RADAR_VIDS]
+    
+    out.append(f"✅ {len(ports)} porta(s) encontrada(s), {len(preferred)} com chip USB-serial conhecido:\n")
     
-    for i, port in enumerate(ports, 1):
-        print(f"\n📡 Porta {i}:")
-        print(f"   Dispositivo: {port.device}")
-        print(f"   Descrição: {port.description}")
-        print(f"   Fabricante: {port.manufacturer or 'N/A'}")
-        
-        desc_lower = port.description.lower()
-        if any(term in desc_lower for term in 
-               ['usb', 'serial', 'uart', 'cp210', 'ch340', 'ft232', 'arduino', 'esp32', 'modem']):
-            print(f"   🎯 ADEQUADA para radar")
+    for i, port in enumerate(preferred + others, 1):
+        out.append(f"\n📡 Porta {i}:\n")
+        out.append(f"   Dispositivo: {port.device}\n")
+        out.append(f"   Descrição: {port.description}\n")
+        out.append(f"   Fabricante: {port.manufacturer or 'N/A'}\n")
+        
+        if i <= len(preferred):
+            out.append(f"   🎯 ADEQUADA para radar (VID {port.vid:04X})\n")
+        elif _is_radar_port(port.description):
+            out.append("   🎯 ADEQUADA para radar\n")
         else:
-            print(f"   ⚠️ Pode não ser adequada")
+            out.append("   ⚠️ Pode não ser adequada\n")
     
-    print("\n" + "=" * 60)
-    return [port.device for port in ports]
+    out.append("\n" + "=" * 60 + "\n")
+    sys.stdout.write("".join(out))
+    sys.stdout.flush()
+    return [port.device for port in preferred + others]
+
+
+# Nível de log e template (constantes) da linha de status de cada radar, por estado
+_RADAR_LINE_TEMPLATES = {
+    'ativo': (logging.INFO, "   🔹 %s: %d ativas | %d total"),
+    'sem_conexao': (logging.WARNING, "   ⚠️ %s: rodando mas conexão perdida"),
+    'parado': (logging.WARNING, "   ⚠️ %s: não está ativo"),
+}
+
+def _log_radar_line(radar):
+    """Registra a linha de status de um radar com o template do seu estado"""
+    running = radar['running']
+    if running and radar['connected']:
+        level, template = _RADAR_LINE_TEMPLATES['ativo']
+        logger.log(level, template, radar['area_tipo'], radar['current_count'], radar['total_detected'])
+    else:
+        level, template = _RADAR_LINE_TEMPLATES['sem_conexao' if running else 'parado']
+        logger.log(level, template, radar['area_tipo'])
 
+# Extrai de uma vez (em C) os contadores consolidados do status de um radar
+_STATUS_TOTALS = operator.itemgetter('current_count', 'total_detected', 'entries_count',
+                                     'exits_count', 'max_simultaneous')
 
-def main():
+def _log_status(status, system):
+    """Consolida e registra o status das duas áreas e das planilhas"""
+    # Status consolidado das duas áreas (uma única passada pelos radares)
+    total_current = total_detected = total_entries = total_exits = max_simultaneous = 0
+    for r in status['radars']:
+        current, detected, entries, exits, simultaneous = _STATUS_TOTALS(r)
+        total_current += current
+        total_detected += detected
+        total_entries += entries
+        total_exits += exits
+        if simultaneous > max_simultaneous:
+            max_simultaneous = simultaneous
+    
+    logger.info("📊 STATUS GRAVATÁ: %d ativas | %d total | %d entradas | %d saídas | Máx: %d",
+                total_current, total_detected, total_entries, total_exits, max_simultaneous)
+    
+    # Status individual por área
+    for radar in status['radars']:
+        _log_radar_line(radar)
+    
+    # ✅ Saúde das planilhas (health_check() usa cache com TTL, sem chamada à API a cada tick)
+    managers = [radar_obj.gsheets_manager for radar_obj in system.radars if radar_obj.gsheets_manager]
+    if len(managers) == len(system.radars) and all(m.health_check() for m in managers):
+        logger.info("📊 PLANILHAS: Ambas funcionando normalmente")
+    else:
+        # Caminho de alerta: contagem completa apenas quando algo falhou
+        healthy_sheets = sum(1 for m in managers if m.health_check())
+        logger.warning("📊 PLANILHAS: %d/%d saudáveis", healthy_sheets, len(system.radars))
+
+def _status_printer(status_queue, system):
+    """Thread consumidora: registra os snapshots de status enfileirados pelo loop principal"""
+    while True:
+        status = status_queue.get()
+        if status is None:  # Sentinela de encerramento
+            break
+        try:
+            _log_status(status, system)
+        except Exception as e:
+            logger.error("❌ Erro ao registrar status: %s", e)
+
+def main(argv=None):
     """Função principal do sistema dual radar Gravatá"""
+    parser = argparse.ArgumentParser(description="Contador dual radar Gravatá")
+    parser.add_argument('--debug', action='store_true',
+                        help="ativa logs DEBUG (diagnóstico de zonas/tracking por pessoa)")
+    args = parser.parse_args(argv)
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+    
     logger.info("🚀 Inicializando Sistema DUAL RADAR GRAVATÁ...")
     available_ports = list_available_ports()
     if len(available_ports) < 2:
@@ -1057,65 +1799,64 @@ def main():
         logger.info("💡 Conecte 2 dispositivos radar USB")
         return
     system = GravataDualRadarSystem()
+    # ✅ Status formatado/registrado fora do loop principal (fila limitada, descarta o mais antigo)
+    status_queue = queue.Queue(maxsize=2)
+    status_thread = None
     try:
-        if not system.initialize():
+        if not system.initialize(ports=available_ports):
             logger.error("❌ Falha na inicialização")
             return
         if not system.start():
             logger.error("❌ Falha ao iniciar sistema")
             return
         
-        # Exibe status inicial
-        logger.info("=" * 80)
-        logger.info("👥 CONTADOR DUAL GRAVATÁ - SISTEMA ESP32 v4.2 AVANÇADO")
-        logger.info("=" * 80)
-        logger.info("🚀 Sistema CORRIGIDO v4.3 - Tracking Preciso para Eventos:")
-        logger.info("   • Duas áreas simultâneas (EXTERNA + INTERNA)")
-        logger.info("   • Lógica baseada em POSIÇÃO REAL (não IDs do Arduino)")
-        logger.info("   • Detecção precisa de entrada/saída por zona")
-        logger.info("   • Pessoas paradas contam apenas UMA vez")
-        logger.info("   • Anti-flickering: evita contagem duplicada")
-        logger.info("   • Ideal para eventos com muitas pessoas")
-        logger.info("   • Tracking por zona + distância + posição")
-        logger.info("⚡ Sistema ativo - Dados sendo enviados para Google Sheets")
-        logger.info("🔄 Reconexão automática habilitada")
-        logger.info("=" * 80)
-
-        # ✅ LOOP PRINCIPAL IGUAL AO SANTA CRUZ
-        status_counter = 0
+        # ✅ Loop de monitoramento no núcleo 0 - só depois de criadas as threads dos radares,
+        # que herdariam a afinidade (cada uma fixa a própria no início do seu loop)
+        _pin_current_thread({0})
+        
+        # Exibe status inicial (um único registro de log)
+        logger.info("%s", _BANNER)
+
+        status_thread = threading.Thread(target=_status_printer, args=(status_queue, system), daemon=True)
+        status_thread.start()
+
+        # ✅ LOOP PRINCIPAL: dorme até uma transição dos radares ou, no máximo, 30 segundos
+        last_snapshot = None
+        ticks_since_log = 0
         while True:
-            time.sleep(5)  # ✅ IGUAL SANTA CRUZ: sleep(5)
-            status_counter += 1
+            triggered = system.status_event.wait(timeout=30)
+            system.status_event.clear()
+            status = system.get_status()
             
-            # ✅ IGUAL SANTA CRUZ: Status a cada 30 segundos (6 * 5s = 30s)
-            if status_counter >= 6:
-                status_counter = 0
-                status = system.get_status()
-                
-                # Status consolidado das duas áreas
-                total_current = sum(r['current_count'] for r in status['radars'])
-                total_detected = sum(r['total_detected'] for r in status['radars'])
-                total_entries = sum(r['entries_count'] for r in status['radars'])
-                total_exits = sum(r['exits_count'] for r in status['radars'])
-                max_simultaneous = max(r['max_simultaneous'] for r in status['radars'])
-                
-                logger.info(f"📊 STATUS GRAVATÁ: {total_current} ativas | {total_detected} total | {total_entries} entradas | {total_exits} saídas | Máx: {max_simultaneous}")
-                
-                # Status individual por área
-                for radar in status['radars']:
-                    area = radar['area_tipo']
-                    if radar['running'] and radar['connected']:
-                        logger.info(f"   🔹 {area}: {radar['current_count']} ativas | {radar['total_detected']} total")
-                    elif radar['running']:
-                        logger.warning(f"   ⚠️ {area}: rodando mas conexão perdida")
-                    else:
-                        logger.warning(f"   ⚠️ {area}: não está ativo")
+            # ✅ Só registra se algo mudou desde o último status (ou no heartbeat);
+            # transições sinalizadas pelos radares são sempre registradas na hora
+            snapshot = tuple(
+                (r['running'], bool(r['connected']), r['current_count'], r['total_detected'],
+                 r['entries_count'], r['exits_count'], r['max_simultaneous'])
+                for r in status['radars']
+            )
+            ticks_since_log += 1
+            if not triggered and snapshot == last_snapshot and ticks_since_log < STATUS_HEARTBEAT_TICKS:
+                continue
+            last_snapshot = snapshot
+            ticks_since_log = 0
+            
+            try:
+                status_queue.put_nowait(status)
+            except queue.Full:
+                # Consumidor atrasado: descarta o snapshot mais antigo
+                with contextlib.suppress(queue.Empty):
+                    status_queue.get_nowait()
+                status_queue.put_nowait(status)
     except KeyboardInterrupt:
         logger.info("🛑 Encerrando por solicitação do usuário...")
-    except Exception as e:
-        logger.error(f"❌ Erro inesperado: {str(e)}")
-        logger.error(traceback.format_exc())
+    except Exception:
+        logger.exception("❌ Erro inesperado")
     finally:
+        if status_thread:
+            with contextlib.suppress(queue.Full):
+                status_queue.put(None, timeout=1)
+            status_thread.join(timeout=1)
         system.stop()
         logger.info("✅ Sistema Dual Radar Gravatá encerrado!")
 
@@ -16,18 +16,33 @@ Foco na detecção precisa sem complexidade excessiva
 
 import gspread
 from google.oauth2.service_account import Credentials
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 import logging
 import os
+import sys
 import time
 import json
 import serial
 import threading
+import queue
 import serial.tools.list_ports
+from serial.tools.list_ports_linux import SysFS
 import gc
+from collections import deque
+from itertools import islice
+import bisect
 from dotenv import load_dotenv
 import subprocess
 
+# orjson opcional (parse de bytes mais rápido)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Configuração de logging simples
 logging.basicConfig(
     level=logging.INFO,
@@ -77,9 +92,93 @@ def reset_esp32_via_esptool(serial_port):
         print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] ERRO inesperado ao resetar ESP32: {e}")
         return False
 
+def reset_esp32_via_dtr(ser):
+    """Reset da ESP32 pelas linhas DTR/RTS da porta já aberta (hard reset do esptool, sem subprocess)"""
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Resetando ESP32 na porta {ser.port} via DTR/RTS...")
+    try:
+        ser.dtr = False  # IO0 em nível alto: ao sair do reset roda o firmware, não o bootloader
+        ser.rts = True   # EN em nível baixo: chip em reset
+        time.sleep(0.1)
+        ser.rts = False  # EN em nível alto: chip sai do reset
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Reset da ESP32 na porta {ser.port} solicitado com sucesso.")
+        return True
+    except (serial.SerialException, OSError, ValueError) as e:
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] ERRO ao resetar ESP32 via DTR/RTS: {e}")
+        return False
+
 # --- Porta serial da ESP32 ---
 ESP32_SERIAL_PORT = os.getenv("ESP32_SERIAL_PORT", "/dev/ttyACM0")
 
+# Termos (já em minúsculas) que indicam uma porta adequada para o radar
+_PORT_HINTS = ('usb', 'serial', 'arduino', 'esp32', 'cp210', 'ch340')
+
+# VIDs USB dos conversores da ESP32 (CP210x, CH340, FTDI, ESP32-S3 nativo)
+_PORT_VIDS = {0x10C4, 0x1A86, 0x0403, 0x303A}
+
+# Última porta detectada com sucesso (reinícios após reset não precisam varrer as portas)
+PORT_CACHE_FILE = os.path.expanduser('~/.santa_cruz_port')
+
+# Segundos sem nenhum byte do radar antes de tentar resetar a ESP32
+NO_DATA_RESET_TIMEOUT = 10.0
+
+# Tela redesenhada no máximo a cada DISPLAY_INTERVAL segundos (frames chegam a 10Hz+)
+DISPLAY_INTERVAL = 0.5
+
+# Limpeza de tela via ANSI (só em terminal; em log/arquivo não polui a saída)
+_CLEAR_SCREEN = '\x1b[H\x1b[2J' if sys.stdout.isatty() else ''
+
+# Templates da tela compilados uma vez; a cada redesenho só entram os valores do frame
+_DISPLAY_HEADER = (
+    "\n{color} ═══ CONTADOR SIMPLIFICADO E EFICAZ ═══\n"
+    "⏰ {timestamp}\n"
+    "📡 {radar_id} | 👥 PESSOAS ATIVAS: {active}\n"
+    "🎯 TOTAL DETECTADAS: {total}\n"
+    "📊 MÁXIMO SIMULTÂNEO: {maximum}\n"
+    "⏱️ SESSÃO: {minutes:.1f}min"
+)
+_DISPLAY_BUFFER = "📋 BUFFER: {} linhas | ⏳ Enviando a cada 30s"
+_DISPLAY_SYNCED = "📋 PLANILHA: Sincronizada ✅"
+_DISPLAY_TABLE_HEADER = "\n".join([
+    f"{'#':<2} {'Distância':<10} {'Zona':<15} {'Confiança':<10}",
+    "-" * 45,
+])
+_DISPLAY_PERSON = "{:<2} {:<10.2f} {:<15} {:<10}%"
+_DISPLAY_SUMMARY = (
+    "\n📊 RESUMO:\n"
+    "   • Distância média: {avg_distance:.1f}m\n"
+    "   • Confiança média: {avg_confidence:.0f}%\n"
+    "   • Zonas ativas: {zones}"
+)
+_DISPLAY_EMPTY = "\n👻 Nenhuma pessoa detectada no momento"
+
+# Rodapé fixo da tela (texto estático, montado uma única vez)
+_DISPLAY_FOOTER = "\n".join([
+    "\n" + "=" * 50,
+    "🎯 SISTEMA SIMPLIFICADO E EFICAZ",
+    "✅ Usa valores diretos do Arduino",
+    "✅ Zonas baseadas em distância",
+    "✅ Tracking preciso e simples",
+    "✅ Envio otimizado (30s intervalo)",
+    "⚡ Pressione Ctrl+C para encerrar",
+])
+
+# Linhas aguardando a thread de envio; com a fila cheia a mais antiga é descartada
+SHEETS_QUEUE_MAX = 10_000
+
+# Linhas guardadas para envio (Sheets fora do ar): acima disso as mais antigas são descartadas
+PENDING_DATA_MAXLEN = 5000
+
+# Linhas por requisição append_rows
+SHEETS_BATCH_MAX = 500
+
+# Tamanho máximo do buffer serial sem nenhum fim de linha (lixo na porta é descartado)
+RX_BUFFER_MAX = 64 * 1024
+
+def _is_radar_port(port):
+    """Indica se a porta (ListPortInfo) parece a ESP32 do radar, pela descrição ou pelo VID USB"""
+    desc_lower = (port.description or '').lower()
+    return port.vid in _PORT_VIDS or any(hint in desc_lower for hint in _PORT_HINTS)
+
 class SimpleGoogleSheetsManager:
     """Google Sheets Manager Simplificado"""
 
@@ -94,7 +193,10 @@ class SimpleGoogleSheetsManager:
 
         # Conecta
         self.creds = Credentials.from_service_account_file(creds_path, scopes=SCOPES)
-        self.gc = gspread.authorize(self.creds)
+        # ✅ Uma sessão HTTP persistente (keep-alive, pool próprio) para todas as chamadas da planilha
+        session = AuthorizedSession(self.creds)
+        session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self.gc = gspread.Client(auth=self.creds, session=session)
         self.spreadsheet = self.gc.open_by_key(self.spreadsheet_id)
         self.worksheet = self.spreadsheet.get_worksheet(0)
 
@@ -132,8 +234,26 @@ class SimpleGoogleSheetsManager:
                     return False
         return False
 
+    def append_rows(self, rows):
+        """Envia várias linhas em uma única requisição, com o mesmo retry simples"""
+        for attempt in range(2):
+            try:
+                # RAW: mesmo tratamento dos valores que o append_row linha a linha
+                self.worksheet.append_rows(rows, value_input_option='RAW', insert_data_option='INSERT_ROWS')
+                self.last_successful_write = datetime.now()
+                return True
+            except Exception as e:
+                if attempt == 0:
+                    logger.warning(f"⚠️ Erro envio, tentando novamente: {e}")
+                    time.sleep(2)
+                else:
+                    logger.error(f"❌ Falha no envio: {e}")
+                    return False
+        return False
+
 class SimpleZoneManager:
     """Sistema de zonas simplificado baseado apenas em distância"""
+    __slots__ = ('ZONES', 'DESCRIPTIONS', '_floor', '_edges', '_names')
 
     def __init__(self):
         self.ZONES = {
@@ -143,17 +263,7 @@ class SimpleZoneManager:
             'LONGE': (4.0, 6.0),            # 4-6m - Entrada
             'MUITO_LONGE': (6.0, 10.0)      # 6-10m - Área geral
         }
-
-    def get_zone(self, distance):
-        """Determina zona pela distância (mais simples e eficaz)"""
-        for zone_name, (min_dist, max_dist) in self.ZONES.items():
-            if min_dist <= distance < max_dist:
-                return zone_name
-        return 'FORA_ALCANCE'
-
-    def get_zone_description(self, zone_name):
-        """Descrição das zonas"""
-        descriptions = {
+        self.DESCRIPTIONS = {
             'MUITO_PERTO': 'Sala Reboco',
             'PERTO': 'Ativações Próximas',
             'MEDIO': 'Ativações Médias',
@@ -161,10 +271,33 @@ class SimpleZoneManager:
             'MUITO_LONGE': 'Área Geral',
             'FORA_ALCANCE': 'Fora de Alcance'
         }
-        return descriptions.get(zone_name, zone_name)
+
+        # ✅ Faixas contíguas: busca binária pelo limite superior de cada zona
+        self._floor = min(min_dist for min_dist, _ in self.ZONES.values())
+        self._edges = [max_dist for _, max_dist in self.ZONES.values()]
+        self._names = tuple(self.ZONES) + ('FORA_ALCANCE',)
+
+    def get_zone(self, distance):
+        """Determina zona pela distância (mais simples e eficaz)"""
+        if not distance >= self._floor:  # Negativa ou NaN
+            return 'FORA_ALCANCE'
+        return self._names[bisect.bisect_right(self._edges, distance)]
+
+    def get_zone_description(self, zone_name):
+        """Descrição das zonas"""
+        return self.DESCRIPTIONS.get(zone_name, zone_name)
 
 class SimpleRadarCounter:
     """Contador Simplificado e Eficaz"""
+    # Atributos fixos (acesso por offset, sem __dict__): todo atributo novo precisa entrar aqui
+    __slots__ = (
+        'config', 'radar_id', 'port', 'baudrate', 'color',
+        'serial_connection', 'is_running', 'receive_thread', 'gsheets_manager', 'zone_manager',
+        'current_people', 'total_people_detected', 'max_simultaneous_people', 'session_start_time',
+        '_last_render', 'sheets_write_interval', 'pending_data',
+        'sheets_queue', 'sheets_thread', '_sheets_stop',
+        'last_distances', 'last_person_count', 'person_id_counter', 'last_detection_time'
+    )
 
     def __init__(self, config):
         self.config = config
@@ -185,11 +318,20 @@ class SimpleRadarCounter:
         self.total_people_detected = 0
         self.max_simultaneous_people = 0
         self.session_start_time = datetime.now()
+        self._last_render = float('-inf')  # Último redesenho da tela (time.monotonic)
 
         # Configurações de envio otimizadas
-        self.last_sheets_write = 0
         self.sheets_write_interval = 30.0  # 30 segundos (mais responsivo)
-        self.pending_data = []
+        self.pending_data = deque(maxlen=PENDING_DATA_MAXLEN)  # Linhas já retiradas da fila (só a thread de envio usa)
+
+        # ✅ Envio em thread própria: a leitura serial só enfileira, nunca espera o Google
+        self.sheets_queue = queue.Queue(maxsize=SHEETS_QUEUE_MAX)
+        self.sheets_thread = None
+        self._sheets_stop = threading.Event()
+
+        # Estado do frame anterior (detecção de novas pessoas e de área esvaziada)
+        self.last_distances = frozenset()
+        self.last_person_count = 0
 
         # IDs únicos baseados em posição estável
         self.person_id_counter = 0
@@ -212,12 +354,22 @@ class SimpleRadarCounter:
             self.serial_connection = serial.Serial(
                 port=self.port,
                 baudrate=self.baudrate,
-                timeout=2.0,
+                timeout=1.0,  # read(1) bloqueia no máximo 1s esperando o próximo byte
                 write_timeout=2.0
             )
 
+            # Buffer de recepção maior (só Windows expõe isso no pyserial; no Linux o buffer do tty é fixo no kernel)
+            if hasattr(self.serial_connection, 'set_buffer_size'):
+                try:
+                    self.serial_connection.set_buffer_size(rx_size=65536, tx_size=4096)
+                except Exception as e:
+                    logger.debug(f"Buffer serial não ajustado: {e}")
+
             time.sleep(3)  # Aguarda estabilização
 
+            # Descarta frames parciais/antigos acumulados durante a (re)conexão
+            self.serial_connection.reset_input_buffer()
+
             if self.serial_connection.is_open:
                 logger.info(f"✅ Conectado com sucesso!")
                 return True
@@ -228,14 +380,26 @@ class SimpleRadarCounter:
         return False
 
     def find_serial_port(self):
-        """Detecta porta serial automaticamente"""
-        ports = list(serial.tools.list_ports.comports())
-
-        for port in ports:
-            desc_lower = port.description.lower()
-            if any(term in desc_lower for term in
-                  ['usb', 'serial', 'arduino', 'esp32', 'cp210', 'ch340']):
+        """Detecta porta serial automaticamente (tenta antes a última porta detectada)"""
+        try:
+            with open(PORT_CACHE_FILE) as f:
+                cached_port = f.read().strip()
+        except OSError:
+            cached_port = None
+        # Só consulta a porta salva (sysfs); após reenumeração o tty pode ser outro dispositivo
+        if cached_port and cached_port != self.port and os.path.exists(cached_port):
+            if _is_radar_port(SysFS(cached_port)):
+                logger.info(f"🔍 Porta anterior encontrada: {cached_port}")
+                return cached_port
+
+        for port in serial.tools.list_ports.comports():
+            if _is_radar_port(port):
                 logger.info(f"🔍 Porta detectada: {port.device}")
+                try:
+                    with open(PORT_CACHE_FILE, 'w') as f:
+                        f.write(port.device)
+                except OSError as e:
+                    logger.debug(f"Não foi possível salvar a porta detectada: {e}")
                 return port.device
 
         return None
@@ -250,6 +414,9 @@ class SimpleRadarCounter:
         self.is_running = True
         self.receive_thread = threading.Thread(target=self.receive_data_loop, daemon=True)
         self.receive_thread.start()
+        self._sheets_stop.clear()
+        self.sheets_thread = threading.Thread(target=self._sheets_writer_loop, daemon=True)
+        self.sheets_thread.start()
 
         logger.info(f"🚀 Contador simplificado iniciado!")
         return True
@@ -264,52 +431,77 @@ class SimpleRadarCounter:
             except:
                 pass
 
+        # Acorda a thread de envio para uma última tentativa com o que ficou na fila
+        self._sheets_stop.set()
+        if self.sheets_thread and self.sheets_thread.is_alive():
+            self.sheets_thread.join(timeout=10)
+
         logger.info("🛑 Contador parado!")
 
     def receive_data_loop(self):
         """Loop de recebimento simplificado com auto recovery e reset ESP32"""
-        buffer = ""
-        falha_leitura_contador = 0
+        buffer = bytearray()  # Bytes recebidos ainda sem '\n'
+        ultimo_dado = time.monotonic()  # Último byte recebido (para detectar radar mudo)
         while self.is_running:
             try:
-                if not self.serial_connection or not self.serial_connection.is_open:
+                ser = self.serial_connection
+                if not ser or not ser.is_open:
                     logger.warning("⚠️ Conexão perdida, tentando reconectar...")
                     if self.connect():
-                        buffer = ""
-                        falha_leitura_contador = 0
+                        buffer.clear()
+                        ultimo_dado = time.monotonic()
                         continue
                     else:
                         time.sleep(5)
                         continue
-                # Lê dados disponíveis
-                if self.serial_connection.in_waiting > 0:
-                    data = self.serial_connection.read(self.serial_connection.in_waiting)
-                    text = data.decode('utf-8', errors='ignore')
-                    buffer += text
-                    falha_leitura_contador = 0  # Resetar contador se dados chegarem
-                    # Processa linhas completas
-                    if '\n' in buffer:
-                        lines = buffer.split('\n')
-                        buffer = lines[-1]
-                        for line in lines[:-1]:
-                            line = line.strip()
-                            if line.startswith('{'):
+
+                # ✅ Lookups resolvidos uma vez por conexão; erros de leitura voltam ao laço externo (reconexão)
+                read = ser.read
+                process = self.process_json_data
+                json_loads = _json_loads
+                monotonic = time.monotonic
+                while self.is_running:
+                    # Bloqueia até o primeiro byte (ou timeout) e depois drena o que já chegou numa leitura só
+                    data = read(1)
+                    if data:
+                        waiting = ser.in_waiting
+                        if waiting:
+                            data += read(waiting)
+                        buffer += data
+                        ultimo_dado = monotonic()
+                        # Processa linhas completas: tudo até o último '\n'; o resto fica no buffer
+                        fim = buffer.rfind(b'\n')
+                        if fim >= 0:
+                            completas = bytes(buffer[:fim])
+                            del buffer[:fim + 1]
+                            for line in completas.split(b'\n'):
+                                if len(line) < 2:  # Linhas vazias / só '\r' (não cabem nem um '{}')
+                                    continue
+                                # ✅ Frames JSON começam com '{': só faz strip() quando o 1º byte não é '{'
+                                # (sem strip no caso comum: espaços e '\r' nas pontas são whitespace válido em JSON)
+                                if line[0] != 0x7B:
+                                    line = line.strip()
+                                    if line[:1] != b'{':
+                                        continue
                                 try:
-                                    data_json = json.loads(line)
-                                    self.process_json_data(data_json)
-                                except json.JSONDecodeError:
-                                    logger.debug(f"JSON inválido: {line[:50]}...")
-                else:
-                    falha_leitura_contador += 1
-                    if falha_leitura_contador >= 100:  # Ex: 100 ciclos * 0.1s = 10 segundos sem dados
+                                    data_json = json_loads(line)  # orjson/json aceitam bytes UTF-8 diretamente
+                                except ValueError:  # JSON inválido ou bytes não-UTF-8
+                                    if logger.isEnabledFor(logging.DEBUG):
+                                        logger.debug("JSON inválido: %s...", line[:50])
+                                    continue
+                                process(data_json)
+                        elif len(buffer) > RX_BUFFER_MAX:
+                            logger.warning("⚠️ Dados sem fim de linha na porta serial, descartando buffer")
+                            buffer.clear()
+                    elif monotonic() - ultimo_dado >= NO_DATA_RESET_TIMEOUT:
                         logger.warning(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] NENHUM DADO RECEBIDO DO RADAR POR MUITO TEMPO. TENTANDO RESETAR ESP32...")
-                        if reset_esp32_via_esptool(ESP32_SERIAL_PORT):
+                        # Mesma porta já aberta: reset direto pelas linhas de controle; senão, esptool.py
+                        resetada = ser.port == ESP32_SERIAL_PORT and reset_esp32_via_dtr(ser)
+                        if resetada or reset_esp32_via_esptool(ESP32_SERIAL_PORT):
                             time.sleep(10)  # Dê mais tempo para a ESP32 reiniciar
-                            falha_leitura_contador = 0
                         else:
                             logger.error(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] FALHA CRÍTICA: Não foi possível resetar a ESP32.")
-                            falha_leitura_contador = 0
-                time.sleep(0.1)
+                        ultimo_dado = monotonic()
             except Exception as e:
                 logger.error(f"❌ Erro no loop: {e}")
                 time.sleep(2)
@@ -328,56 +520,66 @@ class SimpleRadarCounter:
             # ✅ TRACKING SIMPLIFICADO MAS EFICAZ
             self.update_people_tracking(active_people)
 
-            # ✅ DISPLAY LIMPO E INFORMATIVO
-            if os.getenv('TERM'):
-                os.system('clear')
-
-            print(f"\n{self.color} ═══ CONTADOR SIMPLIFICADO E EFICAZ ═══")
-            print(f"⏰ {formatted_timestamp}")
-            print(f"📡 {radar_id} | 👥 PESSOAS ATIVAS: {len(active_people)}")
-            print(f"🎯 TOTAL DETECTADAS: {self.total_people_detected}")
-            print(f"📊 MÁXIMO SIMULTÂNEO: {self.max_simultaneous_people}")
-
-            # Runtime
-            runtime = datetime.now() - self.session_start_time
-            runtime_str = f"{runtime.total_seconds()/60:.1f}min"
-            print(f"⏱️ SESSÃO: {runtime_str}")
-
-            # Status da planilha
-            pending_count = len(self.pending_data)
-            if pending_count > 0:
-                print(f"📋 BUFFER: {pending_count} linhas | ⏳ Enviando a cada 30s")
-            else:
-                print(f"📋 PLANILHA: Sincronizada ✅")
+            # ✅ DISPLAY LIMPO E INFORMATIVO: no máximo a cada DISPLAY_INTERVAL, montado em memória
+            now = time.monotonic()
+            render = now - self._last_render >= DISPLAY_INTERVAL
+            out = []
+            if render:
+                self._last_render = now
+                runtime = datetime.now() - self.session_start_time
+                out.append(_DISPLAY_HEADER.format(
+                    color=self.color,
+                    timestamp=formatted_timestamp,
+                    radar_id=radar_id,
+                    active=len(active_people),
+                    total=self.total_people_detected,
+                    maximum=self.max_simultaneous_people,
+                    minutes=runtime.total_seconds() / 60,
+                ))
+
+                # Status da planilha
+                pending_count = len(self.pending_data) + self.sheets_queue.qsize()
+                if pending_count > 0:
+                    out.append(_DISPLAY_BUFFER.format(pending_count))
+                else:
+                    out.append(_DISPLAY_SYNCED)
 
             if active_people:
-                print(f"\n👥 DETECÇÕES ATUAIS ({len(active_people)}):")
-                print(f"{'#':<2} {'Distância':<10} {'Zona':<15} {'Confiança':<10}")
-                print("-" * 45)
+                if render:
+                    out.append(f"\n👥 DETECÇÕES ATUAIS ({len(active_people)}):")
+                    out.append(_DISPLAY_TABLE_HEADER)
 
                 distances = []
                 zones = []
-                confidences = []
+                sum_distance = 0
+                sum_confidence = 0
+                get_zone = self.zone_manager.get_zone  # Lookups fora do loop por pessoa
+                get_zone_description = self.zone_manager.get_zone_description
 
+                # ✅ Uma única passada: exibição, listas e somas para as médias
                 for i, person in enumerate(active_people):
                     # ✅ USA DIRETAMENTE OS VALORES DO ARDUINO (sem cálculos extras)
                     distance = person.get("distance_raw", 0)
                     confidence = person.get("confidence", 85)
 
                     # ✅ ZONA SIMPLIFICADA BASEADA APENAS EM DISTÂNCIA
-                    zone = self.zone_manager.get_zone(distance)
-                    zone_desc = self.zone_manager.get_zone_description(zone)
+                    zone = get_zone(distance)
 
-                    print(f"{i+1:<2} {distance:<10.2f} {zone_desc:<15} {confidence:<10}%")
+                    if render:
+                        zone_desc = get_zone_description(zone)
+                        out.append(_DISPLAY_PERSON.format(i + 1, distance, zone_desc, confidence))
 
                     distances.append(distance)
                     zones.append(zone)
-                    confidences.append(confidence)
+                    sum_distance += distance
+                    sum_confidence += confidence
+
+                # Médias calculadas uma vez: usadas na planilha e no resumo da tela
+                avg_distance = sum_distance / len(active_people)
+                avg_confidence = sum_confidence / len(active_people)
 
                 # ✅ PREPARA DADOS PARA PLANILHA (simplificado)
                 if self.gsheets_manager:
-                    avg_distance = sum(distances) / len(distances)
-                    avg_confidence = sum(confidences) / len(confidences)
                     zones_str = ",".join(sorted(set(zones)))
                     distances_str = ",".join([f"{d:.1f}" for d in distances])
 
@@ -391,39 +593,37 @@ class SimpleRadarCounter:
                         self.total_people_detected          # total_detected
                     ]
 
-                    self.pending_data.append(row)
-                    logger.info(f"📋 Dados adicionados: {len(active_people)} pessoas detectadas")
+                    self._queue_row(row)
+                    logger.info("📋 Dados adicionados: %d pessoas detectadas", len(active_people))
 
-                print(f"\n📊 RESUMO:")
-                print(f"   • Distância média: {sum(distances)/len(distances):.1f}m")
-                print(f"   • Confiança média: {sum(confidences)/len(confidences):.0f}%")
-                print(f"   • Zonas ativas: {', '.join(set(self.zone_manager.get_zone_description(z) for z in zones))}")
+                if render:
+                    out.append(_DISPLAY_SUMMARY.format(
+                        avg_distance=avg_distance,
+                        avg_confidence=avg_confidence,
+                        zones=', '.join(set(get_zone_description(z) for z in zones)),
+                    ))
 
             else:
-                print(f"\n👻 Nenhuma pessoa detectada no momento")
+                if render:
+                    out.append(_DISPLAY_EMPTY)
 
                 # Envia dados zerados se mudou de estado
-                if self.gsheets_manager and hasattr(self, 'last_person_count'):
-                    if getattr(self, 'last_person_count', 0) > 0:
+                if self.gsheets_manager:
+                    if self.last_person_count > 0:
                         row = [
                             radar_id, formatted_timestamp, 0, "0", "VAZIA", "0", self.total_people_detected
                         ]
-                        self.pending_data.append(row)
-                        logger.info(f"📋 Área vazia detectada")
+                        self._queue_row(row)
+                        logger.info("📋 Área vazia detectada")
 
             # Armazena último count para detectar mudanças
-            setattr(self, 'last_person_count', len(active_people))
+            self.last_person_count = len(active_people)
 
-            print("\n" + "=" * 50)
-            print("🎯 SISTEMA SIMPLIFICADO E EFICAZ")
-            print("✅ Usa valores diretos do Arduino")
-            print("✅ Zonas baseadas em distância")
-            print("✅ Tracking preciso e simples")
-            print("✅ Envio otimizado (30s intervalo)")
-            print("⚡ Pressione Ctrl+C para encerrar")
-
-            # ✅ ENVIA DADOS PARA PLANILHA
-            self.send_pending_data()
+            if render:
+                out.append(_DISPLAY_FOOTER)
+                # ✅ Uma única escrita no terminal (limpeza via ANSI, sem fork de 'clear')
+                sys.stdout.write(_CLEAR_SCREEN + "\n".join(out) + "\n")
+                sys.stdout.flush()
 
         except Exception as e:
             logger.error(f"❌ Erro processando JSON: {e}")
@@ -433,59 +633,83 @@ class SimpleRadarCounter:
         current_time = time.time()
 
         # ✅ LÓGICA SIMPLIFICADA: conta pessoas novas por distância única
-        current_distances = set()
-
-        for person in active_people:
-            distance = person.get("distance_raw", 0)
-            # Agrupa por distância (arredondada para evitar micro-variações)
-            rounded_distance = round(distance, 1)
-            current_distances.add(rounded_distance)
+        # Agrupa por distância (arredondada para evitar micro-variações), numa única expressão
+        current_distances = frozenset([round(person.get("distance_raw", 0), 1) for person in active_people])
 
         # ✅ DETECTA NOVAS PESSOAS (distâncias que não existiam antes)
-        previous_distances = getattr(self, 'last_distances', set())
-        new_distances = current_distances - previous_distances
+        # Caso comum a 10Hz: mesmas distâncias do frame anterior, nada a comparar nem a guardar
+        if current_distances != self.last_distances:
+            new_distances = current_distances - self.last_distances
+
+            if new_distances:
+                new_count = len(new_distances)
+                self.total_people_detected += new_count
+                logger.info("🆕 %d nova(s) pessoa(s) detectada(s)!", new_count)
 
-        if new_distances:
-            new_count = len(new_distances)
-            self.total_people_detected += new_count
-            logger.info(f"🆕 {new_count} nova(s) pessoa(s) detectada(s)!")
+            # Armazena para próxima comparação
+            self.last_distances = current_distances
 
         # ✅ ATUALIZA MÁXIMO SIMULTÂNEO
         current_count = len(active_people)
         if current_count > self.max_simultaneous_people:
             self.max_simultaneous_people = current_count
-            logger.info(f"📊 Novo máximo simultâneo: {current_count} pessoas")
+            logger.info("📊 Novo máximo simultâneo: %d pessoas", current_count)
 
-        # Armazena para próxima comparação
-        setattr(self, 'last_distances', current_distances)
         self.last_detection_time = current_time
 
-    def send_pending_data(self):
-        """Envia dados para planilha de forma otimizada"""
+    def _queue_row(self, row):
+        """Entrega a linha à thread de envio sem bloquear; com a fila cheia descarta a mais antiga"""
         try:
-            current_time = time.time()
+            self.sheets_queue.put_nowait(row)
+        except queue.Full:
+            try:
+                self.sheets_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.sheets_queue.put_nowait(row)
 
-            # Verifica intervalo
-            if (current_time - self.last_sheets_write) < self.sheets_write_interval:
-                return
+    def _sheets_writer_loop(self):
+        """Thread de envio: a cada intervalo junta as linhas da fila e envia em uma única requisição"""
+        while not self._sheets_stop.wait(self.sheets_write_interval):
+            self._drain_sheets_queue()
+            self.send_pending_data()
 
+        # Encerrando: última tentativa com o que ainda estava na fila
+        self._drain_sheets_queue()
+        self.send_pending_data()
+
+    def _drain_sheets_queue(self):
+        """Move as linhas enfileiradas para pending_data (sem bloquear)"""
+        descartadas = 0
+        while True:
+            try:
+                row = self.sheets_queue.get_nowait()
+            except queue.Empty:
+                break
+            if len(self.pending_data) == PENDING_DATA_MAXLEN:
+                descartadas += 1
+            self.pending_data.append(row)
+        if descartadas:
+            logger.warning("⚠️ Buffer cheio: %d linhas antigas descartadas", descartadas)
+
+    def send_pending_data(self):
+        """Envia dados para planilha de forma otimizada (chamado pela thread de envio a cada intervalo)"""
+        try:
             if not self.pending_data or not self.gsheets_manager:
                 return
 
-            # Envia todas as linhas pendentes
-            if self.pending_data:
-                logger.info(f"📊 Enviando {len(self.pending_data)} linhas...")
+            # Envia as linhas pendentes em lotes de até SHEETS_BATCH_MAX (uma requisição por lote)
+            while self.pending_data:
+                batch = list(islice(self.pending_data, SHEETS_BATCH_MAX))
+                logger.info("📊 Enviando %d linhas...", len(batch))
 
-                for row in self.pending_data:
-                    success = self.gsheets_manager.append_row(row)
-                    if not success:
-                        logger.warning("⚠️ Falha no envio, tentando na próxima")
-                        return
-                    time.sleep(0.3)  # Pausa entre linhas
+                if not self.gsheets_manager.append_rows(batch):
+                    logger.warning("⚠️ Falha no envio, tentando na próxima")
+                    return
 
-                logger.info(f"✅ {len(self.pending_data)} linhas enviadas!")
-                self.last_sheets_write = current_time
-                self.pending_data = []  # Limpa buffer
+                logger.info("✅ %d linhas enviadas!", len(batch))
+                for _ in range(len(batch)):  # Só sai do buffer o que foi confirmado
+                    self.pending_data.popleft()
 
         except Exception as e:
             logger.error(f"❌ Erro no envio: {e}")
@@ -557,9 +781,9 @@ def main():
             status = radar.get_status()
 
             if status['running'] and status['connected']:
-                logger.debug(f"💚 Sistema funcionando: {status['total_detected']} total detectadas")
+                logger.debug("💚 Sistema funcionando: %d total detectadas", status['total_detected'])
             else:
-                logger.warning(f"💛 Problemas na conexão - tentando reconectar...")
+                logger.warning("💛 Problemas na conexão - tentando reconectar...")
 
     except KeyboardInterrupt:
         logger.info("🛑 Encerrando por solicitação do usuário...")